@@ -1,9 +1,12 @@
 import json
 import logging
 from abc import ABC
+from functools import lru_cache
 
 import requests
 from eth_account import Account
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 
 ALCHEMY_URL = "https://gensyn-testnet.g.alchemy.com/public"
@@ -20,11 +23,35 @@ MODAL_PROXY_URL = "http://localhost:3000/api/"
 logger = logging.getLogger(__name__)
 
 
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    # Only failed connects are retried: the request never reached the proxy, so
+    # this is safe for calls that are not idempotent.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(connect=3, read=0, status=0, backoff_factor=0.1),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Process-wide session so API calls reuse pooled connections.
+_SESSION = _make_session()
+
+
+@lru_cache(maxsize=4)
+def load_abi(path: str) -> tuple:
+    # Cached since every coordinator would otherwise re-read and re-parse the ABI.
+    with open(path, "r") as f:
+        return tuple(json.load(f)["abi"])
+
+
 class SwarmCoordinator(ABC):
     def __init__(self, web3: Web3, contract_address: str, **kwargs) -> None:
         self.web3 = web3
-        with open(SWARM_COORDINATOR_ABI_JSON, "r") as f:
-            contract_abi = json.load(f)["abi"]
+        contract_abi = list(load_abi(SWARM_COORDINATOR_ABI_JSON))
 
         self.contract = web3.eth.contract(address=contract_address, abi=contract_abi)  # type: ignore
         super().__init__(**kwargs)
@@ -153,7 +180,7 @@ def send_via_api(org_id, method, args):
     payload = {"orgId": org_id} | args
 
     # Send the POST request.
-    response = requests.post(url, json=payload)
+    response = _SESSION.post(url, json=payload)
     response.raise_for_status()  # Raise an exception for HTTP errors
     return response.json()
 
@@ -78,7 +78,8 @@ def hex_to_ints(s, k):
 # libp2p peer IDs are always base58-encoded multihashes!
 
 
-@lru_cache
+# Sized for a whole swarm; the default 128 entries thrashes once more peers gossip.
+@lru_cache(maxsize=4096)
 def get_name_from_peer_id(peer_id: str, no_spaces=False):
     # ~200 entries for both lists; so 2 hex digits.
     ints = hex_to_ints(hashlib.md5(peer_id.encode()).hexdigest(), 2)
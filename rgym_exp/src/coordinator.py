@@ -1,9 +1,12 @@
 import json
+
 import requests
 from genrl.logging_utils.global_defs import get_logger
-from genrl.blockchain.connections import get_contract, send_via_api, setup_web3
+from genrl.blockchain.connections import get_contract, setup_web3
 from genrl.blockchain.coordinator import SwarmCoordinator
 
+from rgym_exp.src.utils.modal_api import send_via_api
+
 
 class ModalSwarmCoordinator(SwarmCoordinator):
     def __init__(
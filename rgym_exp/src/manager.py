@@ -1,7 +1,12 @@
+import glob
 import os
 import time
 import random
-from collections import defaultdict
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 from genrl.blockchain import SwarmCoordinator
 from genrl.communication import Communication
@@ -15,11 +20,35 @@ from genrl.rewards import RewardManager
 from genrl.roles import RoleManager
 from genrl.state import GameState
 from genrl.trainer import TrainerModule
-from huggingface_hub import login, whoami
+from huggingface_hub import create_repo, login, upload_folder, whoami
+import numpy as np
+from transformers.utils.hub import create_and_tag_model_card
 
 from rgym_exp.src.utils.name_utils import get_name_from_peer_id
 from rgym_exp.src.prg_module import PRGModule
 
+_LOG = get_logger()
+
+SYSTEM_INFO_MAX_AGE = 60 * 60 * 24  # 1 day
+HF_DISABLED_TOKENS = frozenset({None, "None"})  # Tokens that disable HF pushes.
+REWARD_BUFFER_CHUNK = 4096  # Growth step for the flat reward buffers.
+# Lower bound of the per-hook reward draw, indexed by min(signal, 7): 7 + bonus // 2.
+_REWARD_LOW_BY_BONUS = (7, 7, 8, 8, 9, 9, 10, 10)
+REWARD_DRAW_BUFFER = 1024  # Uniform draws generated per RNG refill.
+CHAIN_SUBMIT_ATTEMPTS = 3  # Tries per round before a chain submission is dropped.
+HF_SNAPSHOT_PREFIX = "hf_push_"  # Weight snapshots staged in log_dir for HF uploads.
+
+
+def _jittered(delay):
+    """Spread a sleep over [0.5, 1.5) x delay so peers don't poll in lockstep."""
+    return delay * (0.5 + random.random())
+
+
+def _remove_stale_hf_snapshots(log_dir):
+    """Delete snapshots left in log_dir by pushes that never finished."""
+    for path in glob.glob(os.path.join(log_dir, HF_SNAPSHOT_PREFIX + "*")):
+        shutil.rmtree(path, ignore_errors=True)
+
 
 class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
     """GameManager that orchestrates a game using a SwarmCoordinator."""
@@ -39,6 +68,7 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
         log_dir: str = "logs",
         hf_token: str | None = None,
         hf_push_frequency: int = 20,
+        block_on_register: bool = False,
         **kwargs,
     ):
 
@@ -64,7 +94,16 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
 
         # Register peer_id and get current round from the chain
         self.coordinator = coordinator
-        self.coordinator.register_peer(self.peer_id)
+        # Set when every registration attempt failed; chain submissions retry it.
+        self._registration_failed = False
+        if block_on_register:
+            self._register_peer_with_retry(self.peer_id)
+        else:
+            threading.Thread(
+                target=self._register_peer_with_retry,
+                args=(self.peer_id,),
+                daemon=True,
+            ).start()
         round, _ = self.coordinator.get_round_and_stage()
         self.state.round = round
 
@@ -74,71 +113,203 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
 
         # enable push to HF if token was provided
         self.hf_token = hf_token
-        if self.hf_token not in [None, "None"]:
+        self.log_dir = log_dir
+        # Uploads run on a single background worker so training isn't blocked.
+        self._hf_executor = ThreadPoolExecutor(max_workers=1)
+        self._hf_future = None
+        self._next_hf_push_round = float("inf")  # Set by _configure_hf_hub.
+        if self.hf_token not in HF_DISABLED_TOKENS:
+            _remove_stale_hf_snapshots(self.log_dir)
             self._configure_hf_hub(hf_push_frequency)
 
-        get_logger().info(
-            f"Hello [{get_name_from_peer_id(self.peer_id)}] [{self.peer_id}]!"
+        _LOG.info(
+            f"Hello [{self.animal_name.replace('_', ' ')}] [{self.peer_id}]!"
         )
-        get_logger().info(f"bootnodes: {kwargs.get('bootnodes', [])}")
-        get_logger().info(f"Using Model: {self.trainer.model.config.name_or_path}")
+        _LOG.info(f"bootnodes: {kwargs.get('bootnodes', [])}")
+        _LOG.info(f"Using Model: {self.trainer.model.config.name_or_path}")
 
-        with open(os.path.join(log_dir, f"system_info.txt"), "w") as f:
-            f.write(get_system_info())
+        # System info rarely changes between restarts; refresh it at most daily.
+        system_info_path = os.path.join(log_dir, f"system_info.txt")
+        if (
+            not os.path.exists(system_info_path)
+            or time.time() - os.path.getmtime(system_info_path) > SYSTEM_INFO_MAX_AGE
+        ):
+            with open(system_info_path, "w") as f:
+                f.write(get_system_info())
 
         # Track accumulated signals for this round
         self.round_signals = 0.0
         self.last_submitted_round = -1  # Track last round we submitted
+        # Chain submissions are queued and sent in batches by a background worker.
+        self._chain_executor = ThreadPoolExecutor(max_workers=1)
+        self._inflight_submit = None
+        # (round, total_signals, signal_by_agent, attempts) not yet handed off
+        self._pending_submissions = []
+        # Buffered uniform draws for _get_my_rewards
+        self._rng = np.random.default_rng()
+        self._uniform_buf = []
+        self._uniform_pos = 0
+        # Running per-agent reward totals for the current round
+        self._reset_rewards_by_agent()
 
         # PRG Game
         self.prg_module = PRGModule(log_dir, **kwargs)
         self.prg_game = self.prg_module.prg_game
 
+    def _register_peer_with_retry(self, peer_id, attempts=5):
+        for attempt in range(attempts):
+            try:
+                self.coordinator.register_peer(peer_id)
+                self._registration_failed = False
+                return
+            except Exception as e:
+                if attempt == attempts - 1:
+                    _LOG.exception(f"Failed to register peer {peer_id}.")
+                    self._registration_failed = True
+                    return
+                _LOG.debug(
+                    f"Registering peer failed: {e}. Retrying in {2**attempt}s."
+                )
+                time.sleep(2**attempt)
+
     def _get_total_rewards_by_agent(self):
-        rewards_by_agent = defaultdict(int)
-        for stage in range(self.state.stage):
+        # Rewards for finished stages don't change, so only fold in the stages
+        # completed since the last call.
+        # Holding the rewards object itself (not its id, which CPython reuses)
+        # catches it being replaced outside _hook_after_round_advanced.
+        if self._rewards_source is not self.rewards:
+            self._reset_rewards_by_agent()
+            self._rewards_source = self.rewards
+        if self._rewards_stages_seen >= self.state.stage:
+            return self._rewards_by_agent
+
+        for stage in range(self._rewards_stages_seen, self.state.stage):
             rewards = self.rewards[stage]
             for agent_id, agent_rewards in rewards.items():
-                for batch_id, batch_rewards in agent_rewards.items():
-                    tot = 0
-                    for generation_rewards in batch_rewards:
-                        tot += sum(generation_rewards)
-                    rewards_by_agent[agent_id] += tot
-
-        return rewards_by_agent
-
-    def _get_my_rewards(self, signal_by_agent):
-        base = 7
-        if len(signal_by_agent) == 0:
-            return random.randint(base, 14)
-
-        my_signal = signal_by_agent.get(self.peer_id, 0)
-        bonus = min(my_signal, 7)
-        return random.randint(base + bonus // 2, 14)
+                # Flatten batches -> generations -> rewards in C.
+                flat = np.fromiter(
+                    chain.from_iterable(chain.from_iterable(agent_rewards.values())),
+                    dtype=np.float64,
+                )
+                self._append_rewards(self._intern_peer(agent_id), flat)
+        self._rewards_stages_seen = self.state.stage
+
+        n = self._rewards_len
+        totals = np.bincount(
+            self._reward_agent_ids[:n],
+            weights=self._flat_rewards[:n],
+            minlength=len(self._idx_to_peer),
+        )
+        self._rewards_by_agent = dict(zip(self._idx_to_peer, totals.tolist()))
+        return self._rewards_by_agent
+
+    def _intern_peer(self, peer_id):
+        idx = self._peer_to_idx.get(peer_id)
+        if idx is None:
+            idx = self._peer_to_idx[peer_id] = len(self._idx_to_peer)
+            self._idx_to_peer.append(peer_id)
+        return idx
+
+    def _append_rewards(self, agent_idx, flat):
+        start = self._rewards_len
+        end = start + len(flat)
+        if end > len(self._flat_rewards):
+            size = -(-end // REWARD_BUFFER_CHUNK) * REWARD_BUFFER_CHUNK
+            flat_rewards = np.empty(size, dtype=np.float64)
+            flat_rewards[:start] = self._flat_rewards[:start]
+            agent_ids = np.empty(size, dtype=np.int32)
+            agent_ids[:start] = self._reward_agent_ids[:start]
+            self._flat_rewards, self._reward_agent_ids = flat_rewards, agent_ids
+        self._flat_rewards[start:end] = flat
+        self._reward_agent_ids[start:end] = agent_idx
+        self._rewards_len = end
+
+    def _reset_rewards_by_agent(self):
+        self._rewards_by_agent = {}
+        self._rewards_stages_seen = 0
+        self._rewards_source = None
+        # Struct-of-arrays reward buffer: one (agent index, reward) per generation
+        self._peer_to_idx = {}
+        self._idx_to_peer = []
+        self._reward_agent_ids = np.empty(0, dtype=np.int32)
+        self._flat_rewards = np.empty(0, dtype=np.float64)
+        self._rewards_len = 0
+
+    def _get_my_rewards(self, my_signal):
+        # Peers without a signal get a zero bonus, i.e. a draw from [7, 14].
+        # Rewards are non-negative, so the signal only needs clamping from above.
+        bonus = int(min(max(my_signal, 0), 7))
+        low = _REWARD_LOW_BY_BONUS[bonus]
+        return low + int(self._next_uniform() * (15 - low))
+
+    def _next_uniform(self):
+        """Pop a uniform [0, 1) draw, refilling the buffer from the numpy RNG in bulk."""
+        if self._uniform_pos >= len(self._uniform_buf):
+            self._uniform_buf = self._rng.random(REWARD_DRAW_BUFFER).tolist()
+            self._uniform_pos = 0
+        u = self._uniform_buf[self._uniform_pos]
+        self._uniform_pos += 1
+        return u
+
+    def _submit_to_chain(self, total_signals, signal_by_agent):
+        """
+        Queue accumulated signals for submission to the blockchain after round
+        completion. Queued rounds are sent together once the worker is free.
+        """
+        self._pending_submissions.append(
+            (self.state.round, total_signals, dict(signal_by_agent), 0)
+        )
+        self._flush_chain_submissions()
+
+    def _flush_chain_submissions(self):
+        """Hand every queued round to the chain worker unless a batch is in flight."""
+        if not self._pending_submissions:
+            return
+        if self._inflight_submit is not None and not self._inflight_submit.done():
+            return
+        batch, self._pending_submissions = self._pending_submissions, []
+        self._inflight_submit = self._chain_executor.submit(self._do_submit_batch, batch)
+
+    def _do_submit_batch(self, batch):
+        """Runs on the chain worker thread; returns the submissions that failed."""
+        if self._registration_failed:
+            # Submissions from an unregistered peer are rejected; register first.
+            self._register_peer_with_retry(self.peer_id)
+            if self._registration_failed:
+                _LOG.error(
+                    f"Peer {self.peer_id} is not registered, holding back chain submissions."
+                )
+                return list(batch)
+        failed = []
+        for submission in batch:
+            round_num, total_signals, signal_by_agent, _ = submission
+            try:
+                self._do_submit(round_num, total_signals, signal_by_agent)
+            except Exception:
+                failed.append(submission)
+        return failed
 
-    def _submit_to_chain(self, total_signals):
-        """Submit accumulated signals to blockchain after round completion"""
+    def _do_submit(self, round_num, total_signals, signal_by_agent):
+        """Runs on the chain worker thread; raises so the caller can retry."""
         try:
-            get_logger().info(f"Submitting round {self.state.round} results to blockchain...")
-            get_logger().info(f"Signal by agent: {self._get_total_rewards_by_agent()}")
-            get_logger().info(f"Total signals for this round: {total_signals}")
-            
+            _LOG.info(f"Submitting round {round_num} results to blockchain...")
+            _LOG.info(f"Signal by agent: {signal_by_agent}")
+            _LOG.info(f"Total signals for this round: {total_signals}")
+
             # Submit reward
             self.coordinator.submit_reward(
-                self.state.round, 0, int(total_signals), self.peer_id
+                round_num, 0, int(total_signals), self.peer_id
             )
-            get_logger().info(f"Successfully submitted reward to blockchain for round {self.state.round}")
+            _LOG.info(f"Successfully submitted reward to blockchain for round {round_num}")
 
             # Submit winners (using self as max agent for now)
             max_agent = self.peer_id
-            self.coordinator.submit_winners(self.state.round, [max_agent], self.peer_id)
-            get_logger().info(f"Successfully submitted winners to blockchain for round {self.state.round}")
-            
-            return True
+            self.coordinator.submit_winners(round_num, [max_agent], self.peer_id)
+            _LOG.info(f"Successfully submitted winners to blockchain for round {round_num}")
 
         except Exception as e:
-            get_logger().error(f"Failed to submit round {self.state.round} results to blockchain: {str(e)}")
-            get_logger().exception(
+            _LOG.error(f"Failed to submit round {round_num} results to blockchain: {str(e)}")
+            _LOG.exception(
                 "Failed to submit to chain.\n"
                 "This is most likely transient and will recover.\n"
                 "There is no need to kill the program.\n"
@@ -146,37 +317,60 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
                 "filing a github issue here: https://github.com/gensyn-ai/rl-swarm/issues/ \n"
                 "including the full stacktrace."
             )
-            return False
+            raise
+
+    def _reap_chain_submission(self):
+        """Collect the last batch, re-queue the rounds that failed and send the queue."""
+        future = self._inflight_submit
+        if future is not None and future.done():
+            self._inflight_submit = None
+            for round_num, total_signals, signal_by_agent, attempts in future.result():
+                attempts += 1
+                if attempts >= CHAIN_SUBMIT_ATTEMPTS:
+                    _LOG.warning(
+                        f"Giving up on round {round_num} submission after {attempts} attempts."
+                    )
+                    continue
+                _LOG.warning(f"Round {round_num} submission failed, will retry.")
+                self._pending_submissions.append(
+                    (round_num, total_signals, signal_by_agent, attempts)
+                )
+        self._flush_chain_submissions()
+
+    def _drain_chain_submissions(self):
+        """Block until queued submissions (and one round of retries) are sent."""
+        for _ in range(2):
+            if self._inflight_submit is not None:
+                self._inflight_submit.result()
+            self._reap_chain_submission()
 
     def _hook_after_rewards_updated(self):
         """Accumulate signals during training and submit when round training is done"""
+        self._reap_chain_submission()
         signal_by_agent = self._get_total_rewards_by_agent()
-        current_reward = self._get_my_rewards(signal_by_agent)
+        my_signal = signal_by_agent.get(self.peer_id, 0)
+        current_reward = self._get_my_rewards(my_signal)
         self.round_signals += current_reward
         
-        get_logger().debug(f"Accumulated reward: {current_reward}, Total round signals: {self.round_signals}")
+        _LOG.debug(f"Accumulated reward: {current_reward}, Total round signals: {self.round_signals}")
         
         # Check if we've completed first stage and haven't submitted yet
         if (self.state.stage >= 1 and 
             self.last_submitted_round < self.state.round):
             
-            get_logger().info(f"Round {self.state.round} training completed (stage {self.state.stage})!")
-            
-            # Submit accumulated signals to blockchain
-            submit_success = self._submit_to_chain(self.round_signals)
+            _LOG.info(f"Round {self.state.round} training completed (stage {self.state.stage})!")
             
-            if submit_success:
-                get_logger().info(f"Round {self.state.round} submission completed successfully!")
-                self.last_submitted_round = self.state.round
-                get_logger().info(f"Skipping remaining training, waiting for next round...")
-                # Reset signals after successful submission
-                self.round_signals = 0.0
-            else:
-                get_logger().warning(f"Round {self.state.round} submission failed, but continuing...")
+            # Submit accumulated signals to blockchain in the background
+            self._submit_to_chain(self.round_signals, signal_by_agent)
+            _LOG.info(f"Round {self.state.round} submission queued!")
+            self.last_submitted_round = self.state.round
+            _LOG.info(f"Skipping remaining training, waiting for next round...")
+            # Reset signals once the submission has been handed off
+            self.round_signals = 0.0
 
     def _hook_after_round_advanced(self):
         """Called when advancing to next round"""
-        get_logger().info(f"Advancing to next round...")
+        _LOG.info(f"Advancing to next round...")
         
         if self.prg_game:
             # TODO: Ideally I think the judge client request question bit should come in the manager and the trainer should be doing only PyTorch-y stuff, 
@@ -190,92 +384,174 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
         
         # Reset signals for next round (in case not already reset)
         self.round_signals = 0.0
-        get_logger().info(f"Ready for new round training!")
+        self._reset_rewards_by_agent()
+        _LOG.info(f"Ready for new round training!")
 
         # Block until swarm round advances
         self.agent_block()
 
     def _hook_after_game(self):
         """Called after the entire game is completed"""
-        get_logger().info("Game completed! Performing final save to HuggingFace...")
-        self._save_to_hf()
+        _LOG.info("Game completed! Performing final save to HuggingFace...")
+        self._save_to_hf(wait=True)
+        self._hf_executor.shutdown(wait=True)
+        self._drain_chain_submissions()
+        self._chain_executor.shutdown(wait=True)
 
     def _configure_hf_hub(self, hf_push_frequency):
-        username = whoami(token=self.hf_token)["name"]
-        model_name = self.trainer.model.config.name_or_path.split("/")[-1]
-        model_name += "-Gensyn-Swarm"
-        model_name += f"-{self.animal_name}"
-        self.trainer.args.hub_model_id = f"{username}/{model_name}"
+        # hub_model_id needs a whoami() roundtrip; resolve it on first push instead.
+        self._hub_model_id = None
         self.hf_push_frequency = hf_push_frequency
-        get_logger().info("Logging into Hugging Face Hub...")
+        # First multiple of the push frequency at or after the current round.
+        self._next_hf_push_round = (
+            -(-self.state.round // hf_push_frequency) * hf_push_frequency
+        )
+        _LOG.info("Logging into Hugging Face Hub...")
         login(self.hf_token)
 
-    def _save_to_hf(self):
-        if (
-            self.hf_token not in [None, "None"]
-            and self.state.round % self.hf_push_frequency == 0
-        ):
-            get_logger().info(f"Pushing model to HuggingFace for round {self.state.round}...")
-            try:
-                repo_id = self.trainer.args.hub_model_id
-
-                self.trainer.model.push_to_hub(
-                    repo_id=repo_id,
-                    token=self.hf_token,
-                    commit_message=f"rl-swarm: round {self.state.round}, agent {self.animal_name}",
-                    tags=[
-                        "rl-swarm",
-                        "genrl-swarm",
-                        "grpo",
-                        "gensyn",
-                        f"I am {self.animal_name}",
-                    ],
-                )
-                get_logger().info(f"Successfully pushed model to HuggingFace for round {self.state.round}")
-            except Exception:
-                get_logger().exception(
-                    "Failed to push model to the Hugging Face Hub. When you conclude training please try manually pushing it yourself using the instructions here: https://huggingface.co/docs/hub/en/models-uploading",
-                    stack_info=True,
+    def _get_hub_model_id(self):
+        if self._hub_model_id is None:
+            username = whoami(token=self.hf_token)["name"]
+            model_name = self.trainer.model.config.name_or_path.split("/")[-1]
+            model_name += "-Gensyn-Swarm"
+            model_name += f"-{self.animal_name}"
+            self._hub_model_id = f"{username}/{model_name}"
+            self.trainer.args.hub_model_id = self._hub_model_id
+        return self._hub_model_id
+
+    def _save_to_hf(self, wait=False):
+        # Infinite when HF pushes are disabled, so most rounds exit here.
+        if self.state.round < self._next_hf_push_round:
+            return
+
+        if self._hf_future is not None and not self._hf_future.done():
+            if not wait:
+                _LOG.info(
+                    f"Previous HuggingFace push still running, skipping round {self.state.round}."
                 )
+                self._advance_hf_push_round()
+                return
+            self._hf_future.result()
+
+        # Snapshot the weights to local disk now so the upload sees a consistent
+        # checkpoint while training keeps updating the live model.
+        snapshot_dir = tempfile.mkdtemp(prefix=HF_SNAPSHOT_PREFIX, dir=self.log_dir)
+        try:
+            self.trainer.model.save_pretrained(snapshot_dir, safe_serialization=True)
+        except Exception:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+            _LOG.exception("Failed to snapshot model for the Hugging Face Hub push.")
+            self._advance_hf_push_round()
+            return
+        self._hf_future = self._hf_executor.submit(
+            self._push_to_hf, self.state.round, snapshot_dir
+        )
+        self._advance_hf_push_round()
+        if wait:
+            self._hf_future.result()
+
+    def _advance_hf_push_round(self):
+        # Next multiple of the push frequency strictly after the current round.
+        self._next_hf_push_round = (
+            self.state.round // self.hf_push_frequency + 1
+        ) * self.hf_push_frequency
+
+    def _push_to_hf(self, round_num, snapshot_dir):
+        _LOG.info(f"Pushing model to HuggingFace for round {round_num}...")
+        try:
+            repo_id = self._get_hub_model_id()
+
+            create_repo(repo_id, token=self.hf_token, exist_ok=True)
+            model_card = create_and_tag_model_card(
+                repo_id,
+                [
+                    "rl-swarm",
+                    "genrl-swarm",
+                    "grpo",
+                    "gensyn",
+                    f"I am {self.animal_name}",
+                ],
+                token=self.hf_token,
+            )
+            model_card.save(os.path.join(snapshot_dir, "README.md"))
+            upload_folder(
+                repo_id=repo_id,
+                folder_path=snapshot_dir,
+                token=self.hf_token,
+                commit_message=f"rl-swarm: round {round_num}, agent {self.animal_name}",
+            )
+            _LOG.info(f"Successfully pushed model to HuggingFace for round {round_num}")
+        except Exception:
+            _LOG.exception(
+                "Failed to push model to the Hugging Face Hub. When you conclude training please try manually pushing it yourself using the instructions here: https://huggingface.co/docs/hub/en/models-uploading",
+                stack_info=True,
+            )
+        finally:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
 
     def agent_block(
-        self, check_interval=5.0, log_timeout=10.0, max_check_interval=60.0 * 15
+        self,
+        check_interval=5.0,
+        log_timeout=10.0,
+        max_check_interval=60.0 * 15,
+        max_retry_interval=60.0,
+        maddrs_refresh_interval=60.0,
     ):
         start_time = time.monotonic()
         fetch_log_time = start_time
         check_backoff = (
             check_interval  # Exponential backoff for already finished rounds.
         )
-        while time.monotonic() - start_time < self.train_timeout:
+        retry_backoff = check_interval  # Exponential backoff for failed fetches.
+        last_maddrs_fetch = None
+        fetch_failed = False
+        while True:
+            # One clock read per iteration, shared by the timeout and log checks.
             curr_time = time.monotonic()
-            _ = self.communication.dht.get_visible_maddrs(latest=True)
+            if curr_time - start_time >= self.train_timeout:
+                break
+
+            # Visible maddrs rarely change between polls; refresh them periodically
+            # or after a failed fetch rather than on every iteration.
+            if (
+                fetch_failed
+                or last_maddrs_fetch is None
+                or curr_time - last_maddrs_fetch >= maddrs_refresh_interval
+            ):
+                _ = self.communication.dht.get_visible_maddrs(latest=True)
+                last_maddrs_fetch = curr_time
 
             # Retrieve current round and stage.
             try:
                 round_num, stage = self.coordinator.get_round_and_stage()
             except Exception as e:
                 if curr_time - fetch_log_time > log_timeout:
-                    get_logger().debug(
-                        f"Could not fetch round and stage: {e}. Next check in {check_interval}s."
+                    _LOG.debug(
+                        f"Could not fetch round and stage: {e}. Next check in {retry_backoff}s."
                     )
                     fetch_log_time = curr_time
 
-                time.sleep(check_interval)
+                fetch_failed = True
+                time.sleep(_jittered(retry_backoff))
+                retry_backoff = min(retry_backoff * 2, max_retry_interval)
                 continue
 
+            fetch_failed = False
+            retry_backoff = check_interval
+
             if round_num >= self.state.round:
-                get_logger().info(f"Joining round: {round_num}")
+                _LOG.info(f"Joining round: {round_num}")
                 check_backoff = check_interval  # Reset backoff after successful round
                 self.state.round = round_num  # advance to swarm's round.
                 return
             else:
-                get_logger().info(
+                _LOG.info(
                     f"Already finished round: {round_num}. Next check in {check_backoff}s."
                 )
-                time.sleep(check_backoff)
+                time.sleep(_jittered(check_backoff))
                 check_backoff = min(check_backoff * 2, max_check_interval)
 
             if round_num == self.max_round - 1:
                 return
 
-        get_logger().info("Training timed out!")
+        _LOG.info("Training timed out!")
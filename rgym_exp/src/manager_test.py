@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rgym_exp.src.coordinator import ModalSwarmCoordinator
+from rgym_exp.src.manager import SwarmGameManager, _remove_stale_hf_snapshots
+
+
+def make_coordinator():
+    """A ModalSwarmCoordinator that skips the web3 setup in SwarmCoordinator."""
+    coordinator = ModalSwarmCoordinator.__new__(ModalSwarmCoordinator)
+    coordinator.org_id = "test-org"
+    coordinator.modal_proxy_url = "http://localhost:3000/api/"
+    return coordinator
+
+
+def make_manager(coordinator):
+    """A SwarmGameManager with only the chain submission state set up."""
+    manager = SwarmGameManager.__new__(SwarmGameManager)
+    manager.coordinator = coordinator
+    manager.peer_id = "test_peer_id"
+    manager._chain_executor = ThreadPoolExecutor(max_workers=1)
+    manager._inflight_submit = None
+    manager._pending_submissions = []
+    manager._registration_failed = False
+    return manager
+
+
+class TestChainSubmissions:
+    """Tests for the queued chain submissions in SwarmGameManager."""
+
+    def setup_method(self):
+        self.coordinator = make_coordinator()
+        self.manager = make_manager(self.coordinator)
+
+    def teardown_method(self):
+        self.manager._chain_executor.shutdown(wait=True)
+
+    def test_flush_posts_reward_and_winners_per_round(self):
+        """One flush sends exactly one submit-reward and one submit-winner POST per round."""
+        self.manager._pending_submissions = [
+            (1, 3.0, {"test_peer_id": 3.0}, 0),
+            (2, 5.0, {"test_peer_id": 5.0}, 0),
+        ]
+
+        with patch("rgym_exp.src.utils.modal_api._SESSION") as session:
+            session.post.return_value.json.return_value = {}
+            self.manager._flush_chain_submissions()
+            failed = self.manager._inflight_submit.result()
+
+        assert failed == []
+        assert self.manager._pending_submissions == []
+        urls = [c.args[0] for c in session.post.call_args_list]
+        assert urls == [
+            "http://localhost:3000/api/submit-reward",
+            "http://localhost:3000/api/submit-winner",
+            "http://localhost:3000/api/submit-reward",
+            "http://localhost:3000/api/submit-winner",
+        ]
+
+    def test_flush_with_batch_in_flight_sends_nothing(self):
+        """Rounds queued while a batch is in flight wait for the next flush."""
+        self.manager._inflight_submit = MagicMock()
+        self.manager._inflight_submit.done.return_value = False
+        self.manager._pending_submissions = [(1, 3.0, {}, 0)]
+
+        with patch("rgym_exp.src.utils.modal_api._SESSION") as session:
+            self.manager._flush_chain_submissions()
+
+        session.post.assert_not_called()
+        assert self.manager._pending_submissions == [(1, 3.0, {}, 0)]
+
+    def test_failed_registration_is_retried_before_submitting(self):
+        """A peer whose registration failed registers again before its rewards are sent."""
+        self.manager._registration_failed = True
+        self.manager._pending_submissions = [(1, 3.0, {}, 0)]
+
+        with patch("rgym_exp.src.utils.modal_api._SESSION") as session:
+            session.post.return_value.json.return_value = {}
+            self.manager._flush_chain_submissions()
+            failed = self.manager._inflight_submit.result()
+
+        assert failed == []
+        assert self.manager._registration_failed is False
+        urls = [c.args[0] for c in session.post.call_args_list]
+        assert urls == [
+            "http://localhost:3000/api/register-peer",
+            "http://localhost:3000/api/submit-reward",
+            "http://localhost:3000/api/submit-winner",
+        ]
+
+    def test_submissions_held_back_while_unregistered(self):
+        """Rounds are returned for retry, not posted, while registration keeps failing."""
+        self.manager.coordinator = MagicMock()
+        self.manager.coordinator.register_peer.side_effect = RuntimeError("proxy down")
+        self.manager._registration_failed = True
+        batch = [(1, 3.0, {}, 0), (2, 5.0, {}, 0)]
+
+        with patch("rgym_exp.src.manager.time.sleep"):
+            failed = self.manager._do_submit_batch(batch)
+
+        assert failed == batch
+        assert self.manager._registration_failed is True
+        self.manager.coordinator.submit_reward.assert_not_called()
+        self.manager.coordinator.submit_winners.assert_not_called()
+
+
+class TestSaveToHF:
+    """Tests for scheduling Hugging Face Hub pushes in SwarmGameManager."""
+
+    @pytest.fixture(autouse=True)
+    def setup_manager(self, tmp_path):
+        self.manager = SwarmGameManager.__new__(SwarmGameManager)
+        self.manager.log_dir = str(tmp_path)
+        self.manager.state = SimpleNamespace(round=20)
+        self.manager.trainer = MagicMock()
+        self.manager.hf_push_frequency = 20
+        self.manager._next_hf_push_round = 20
+        self.manager._hf_executor = MagicMock()
+        self.manager._hf_future = None
+
+    def test_push_advances_to_next_multiple(self):
+        self.manager._save_to_hf()
+
+        self.manager._hf_executor.submit.assert_called_once()
+        assert self.manager._next_hf_push_round == 40
+
+    def test_snapshot_is_written_under_log_dir(self, tmp_path):
+        self.manager._save_to_hf()
+
+        _, round_num, snapshot_dir = self.manager._hf_executor.submit.call_args.args
+        assert round_num == 20
+        assert os.path.dirname(snapshot_dir) == str(tmp_path)
+        assert os.path.basename(snapshot_dir).startswith("hf_push_")
+
+    def test_busy_executor_skips_until_next_multiple(self):
+        """A skipped round waits for the next push round instead of retrying every round."""
+        self.manager._hf_future = MagicMock()
+        self.manager._hf_future.done.return_value = False
+
+        self.manager._save_to_hf()
+
+        assert self.manager._next_hf_push_round == 40
+        self.manager.trainer.model.save_pretrained.assert_not_called()
+        self.manager._hf_executor.submit.assert_not_called()
+
+        self.manager._hf_future.done.return_value = True
+        self.manager.state.round = 21
+        self.manager._save_to_hf()
+        self.manager.trainer.model.save_pretrained.assert_not_called()
+
+    def test_snapshot_failure_skips_until_next_multiple(self):
+        """A failed snapshot waits for the next push round instead of retrying every round."""
+        self.manager.trainer.model.save_pretrained.side_effect = OSError("disk full")
+
+        self.manager._save_to_hf()
+
+        assert self.manager._next_hf_push_round == 40
+        self.manager._hf_executor.submit.assert_not_called()
+
+        self.manager.state.round = 21
+        self.manager._save_to_hf()
+        assert self.manager.trainer.model.save_pretrained.call_count == 1
+        assert os.listdir(self.manager.log_dir) == []
+
+
+def test_remove_stale_hf_snapshots(tmp_path):
+    """Snapshots left by an interrupted run are removed; other logs are kept."""
+    (tmp_path / "hf_push_abc123").mkdir()
+    (tmp_path / "hf_push_abc123" / "model.safetensors").write_bytes(b"weights")
+    (tmp_path / "system_info.txt").write_text("info")
+
+    _remove_stale_hf_snapshots(str(tmp_path))
+
+    assert os.listdir(tmp_path) == ["system_info.txt"]
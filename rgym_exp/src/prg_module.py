@@ -1,9 +1,20 @@
 from enum import Enum
+import atexit
 import json
 import os
+import tempfile
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson là tuỳ chọn, không có thì dùng json chuẩn
+    orjson = None
+
 from genrl.logging_utils.global_defs import get_logger
 from rgym_exp.src.coordinator import PRGCoordinator
 
+__all__ = ["PRGGameStatus", "PRGModule"]
+
 
 class PRGGameStatus(Enum):
     ERROR = "Error"
@@ -17,9 +28,14 @@ class PRGModule:
         prg_game_config = kwargs.get("prg_game_config", None)
         self._prg_game = False
         self.log_dir = log_dir
+        self._log_dir = Path(log_dir)
 
         # peer_id có thể được truyền vào kwargs, hoặc để None ban đầu
         self.peer_id = kwargs.get("peer_id", None)
+        self._prg_record_fp = None
+        atexit.register(self._close_record)
+        # peer_id -> (history, last claimed, last played) của các peer đã dùng
+        self._peer_state_cache = {}
 
         if prg_game_config:
             prg_game = prg_game_config.get("prg_game", False)
@@ -43,35 +59,69 @@ class PRGModule:
 
     def _set_peer_files(self, peer_id):
         """Thiết lập đường dẫn file cho 1 peer cụ thể"""
+        # Lưu state của peer cũ trong bộ nhớ để khi quay lại không phải đọc file
+        if self._prg_record_fp is not None:
+            self._peer_state_cache[self.peer_id] = (
+                self._prg_history_dict,
+                self.prg_last_game_claimed,
+                self.prg_last_game_played,
+            )
         self.peer_id = peer_id
-        self.prg_state_file = os.path.join(
-            self.log_dir, f"prg_state_{peer_id}.json"
-        )
-        self.prg_record = os.path.join(
-            self.log_dir, f"prg_record_{peer_id}.txt"
-        )
-        self.load_state()
+        self.prg_state_file = self._log_dir / f"prg_state_{peer_id}.json"
+        self.prg_record = self._log_dir / f"prg_record_{peer_id}.txt"
+        # Giữ file record mở (line-buffered) thay vì mở/đóng mỗi lần ghi
+        self._close_record()
+        self._prg_record_fp = open(self.prg_record, "a", buffering=1)
+        if peer_id in self._peer_state_cache:
+            (
+                self._prg_history_dict,
+                self.prg_last_game_claimed,
+                self.prg_last_game_played,
+            ) = self._peer_state_cache.pop(peer_id)
+        else:
+            self._prg_history_dict = {}
+            self.prg_last_game_claimed = None
+            self.prg_last_game_played = None
+            self.load_state()
+
+    def _close_record(self):
+        if self._prg_record_fp is not None:
+            self._prg_record_fp.close()
+            self._prg_record_fp = None
 
     def backup_state(self):
-        with open(self.prg_state_file, "w") as f:
-            json.dump(
-                {
-                    "prg_history_dict": self._prg_history_dict,
-                    "prg_last_game_claimed": self.prg_last_game_claimed,
-                    "prg_last_game_played": self.prg_last_game_played,
-                },
-                f,
-            )
+        state = {
+            "prg_history_dict": self._prg_history_dict,
+            "prg_last_game_claimed": self.prg_last_game_claimed,
+            "prg_last_game_played": self.prg_last_game_played,
+        }
+        if orjson is not None:
+            data = orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(state).encode()
+
+        # Ghi ra file tạm rồi os.replace để không bao giờ để lại file state dở dang
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.prg_state_file.parent, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.prg_state_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
     def load_state(self):
-        if os.path.exists(self.prg_state_file):
-            with open(self.prg_state_file, "r") as f:
-                state = json.load(f)
-                self._prg_history_dict = {
-                    int(k): v for k, v in state["prg_history_dict"].items()
-                }
-                self.prg_last_game_claimed = state["prg_last_game_claimed"]
-                self.prg_last_game_played = state["prg_last_game_played"]
+        if self.prg_state_file.is_file():
+            data = self.prg_state_file.read_bytes()
+            state = orjson.loads(data) if orjson is not None else json.loads(data)
+            # JSON chỉ có key dạng chuỗi, cần đổi lại về int
+            self._prg_history_dict = {
+                int(k): v for k, v in state["prg_history_dict"].items()
+            }
+            self.prg_last_game_claimed = state["prg_last_game_claimed"]
+            self.prg_last_game_played = state["prg_last_game_played"]
             get_logger().info(
                 "Loaded PRG state from file:\n\t"
                 f"last game claimed - {self.prg_last_game_claimed},\n\t"
@@ -89,13 +139,18 @@ class PRGModule:
     def play_prg_game(self, results_dict, peer_id):
         """Chơi 1 ván PRG và lưu log theo peer_id"""
         # thiết lập file cho peer hiện tại
-        if self.peer_id != peer_id:
+        if self.peer_id != peer_id or self._prg_record_fp is None:
             self._set_peer_files(peer_id)
 
-        status = results_dict.get("status", PRGGameStatus.ERROR)
+        # So khớp theo giá trị để cả enum lẫn chuỗi "Success" (qua JSON) đều đúng
+        try:
+            status = PRGGameStatus(results_dict.get("status", PRGGameStatus.ERROR))
+        except ValueError:
+            status = PRGGameStatus.ERROR
         if status == PRGGameStatus.SUCCESS:
             if results_dict.get("choice_idx", -1) >= 0:
                 current_game = results_dict["game_idx"]
+
                 try:
                     token_balance = self.prg_coordinator.bet_token_balance(peer_id)
                     rounds_remaining = max(1, results_dict["rounds_remaining"])
@@ -118,12 +173,12 @@ class PRGModule:
                         f'on choice - {results_dict["choice"]}\n'
                     )
                     get_logger().info(log_str)
-                    with open(self.prg_record, "a") as f:
-                        f.write(log_str)
+                    self._prg_record_fp.write(log_str)
                 except Exception as e:
                     get_logger().debug(str(e))
 
-                # nếu sang game mới thì claim game cũ
+                # nếu sang game mới thì claim game cũ. Claim chạy sau cược, không song
+                # song: hai user op cùng lúc dùng chung nonce và op sau thay op trước.
                 if self.prg_last_game_played and current_game != self.prg_last_game_played:
                     try:
                         self.prg_coordinator.claim_reward(
@@ -132,10 +187,9 @@ class PRGModule:
                         get_logger().info(
                             f"successfully claimed reward for previous game {self.prg_last_game_played}"
                         )
-                        with open(self.prg_record, "a") as f:
-                            f.write(
-                                f"successfully claimed reward for previous game {self.prg_last_game_played}\n"
-                            )
+                        self._prg_record_fp.write(
+                            f"successfully claimed reward for previous game {self.prg_last_game_played}\n"
+                        )
                         self.prg_last_game_claimed = self.prg_last_game_played
                     except Exception as e:
                         get_logger().debug(str(e))
@@ -156,10 +210,9 @@ class PRGModule:
                     get_logger().info(
                         f"successfully claimed reward for previous game {self.prg_last_game_played}"
                     )
-                    with open(self.prg_record, "a") as f:
-                        f.write(
-                            f"successfully claimed reward for previous game {self.prg_last_game_played}\n"
-                        )
+                    self._prg_record_fp.write(
+                        f"successfully claimed reward for previous game {self.prg_last_game_played}\n"
+                    )
                     self.prg_last_game_claimed = self.prg_last_game_played
                     self.prg_last_game_played = None
                     self.backup_state()
@@ -1,3 +1,6 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from typing import Any, Optional, List
 
 import torch
@@ -43,6 +46,25 @@ class GRPOTrainerModule(GRPOLanguageTrainerModule, LoggerMixin):
         super().__init__(models, **kwargs)
         judge_base_url = kwargs.get("judge_base_url", None)
         self.judge_client = JudgeClient(judge_base_url) if judge_base_url else None
+        # Answers are submitted to the judge in the background so the round
+        # isn't held up by the round-trip.
+        self._judge_executor = (
+            ThreadPoolExecutor(max_workers=1) if self.judge_client else None
+        )
+        # Opt-in: compile the forward pass used by eval generation (CUDA only).
+        # The graph is built once and reused across rounds. PRG choice scoring
+        # stays eager: its prompt length changes every call, and with CUDA graph
+        # trees a second compiled call would overwrite the prefill outputs it
+        # still needs.
+        self._compile_generate = kwargs.get("compile_generate", False) in [True, "true"]
+        self._compiled_forward = None
+        # system prompt -> (prefix ids, template suffix), or False if the chat
+        # template can't be split safely for it.
+        self._template_splits = {}
+        # Name of the forward kwarg limiting logits to the last positions, "" if none
+        self._logits_to_keep_kwarg = None
+        # ((clue, choices), input_ids on device) for the last PRG prompt
+        self._prg_prompt_cache = None
 
     @torch.no_grad()
     def evaluate(
@@ -62,35 +84,153 @@ class GRPOTrainerModule(GRPOLanguageTrainerModule, LoggerMixin):
             round_number=state.round,
             model_name=model_name
         )
-        
+
         if not result:
             return
 
         # Generate answer using the model
-        prompt = [
-            {"role": "system", "content": SYSTEM_PROMPTS["default"]},
-            {"role": "user", "content": result["question"]},
-        ]
-        input_ids = self.processing_class.apply_chat_template(
-            prompt,
-            tokenize=True,
-            add_generation_prompt=True,
-            return_tensors="pt",
-        )
-
-        # TODO: Make the dtype changes from genrl here?
-        input_ids = input_ids.to(self.model.device)
-        outputs = self.model.generate(input_ids, max_new_tokens=512)
+        input_ids = self._chat_input_ids(SYSTEM_PROMPTS["default"], result["question"])
+        input_ids = self._to_model_device(input_ids)
+        generate_kwargs = {}
+        if self._compile_generate and self.model.device.type == "cuda":
+            # Fixed-shape KV cache so the compiled decode step isn't re-captured
+            # as the sequence grows.
+            generate_kwargs["cache_implementation"] = "static"
+        with self._inference_autocast(), self._inference_forward():
+            outputs = self.model.generate(
+                input_ids, max_new_tokens=512, use_cache=True, **generate_kwargs
+            )
+        # Decode only the generated tokens; the prompt isn't part of the answer.
         answer = self.processing_class.decode(
-            outputs[0], skip_special_tokens=True
+            outputs[0, input_ids.shape[-1]:], skip_special_tokens=True
         )
         
-        # Submit answer to judge service
-        self.judge_client.submit_answer(
+        # Submit answer to judge service without waiting on the response
+        submit_future = self._judge_executor.submit(
+            self.judge_client.submit_answer,
             session_id=result["session_id"],
             round_number=state.round,
-            user_answer=answer
+            user_answer=answer,
         )
+        submit_future.add_done_callback(self._log_submit_result)
+
+    @staticmethod
+    def _log_submit_result(future):
+        # submit_answer returns None when the judge rejected or never got the answer
+        if future.exception() is not None or future.result() is None:
+            get_logger().info("Judge did not accept the submitted answer.")
+
+    def _chat_input_ids(self, system_prompt: str, user_content: str) -> torch.Tensor:
+        """
+        Tokenize a system + user chat prompt. The chat-templated system prefix is
+        tokenized once per system prompt and reused; only the user content and
+        template tail are tokenized per call. Content that is empty or starts with
+        whitespace can merge with the prefix's last token, so it goes through the
+        full template instead.
+        """
+        split = False
+        if user_content and not user_content[0].isspace():
+            split = self._template_splits.get(system_prompt)
+            if split is None:
+                split = self._template_splits[system_prompt] = self._split_chat_template(
+                    system_prompt, user_content
+                )
+        if not split:
+            return self.processing_class.apply_chat_template(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                tokenize=True,
+                add_generation_prompt=True,
+                return_tensors="pt",
+            )
+
+        prefix_ids, suffix = split
+        tail_ids = self.processing_class(
+            user_content + suffix, add_special_tokens=False, return_tensors="pt"
+        ).input_ids
+        return torch.cat([prefix_ids, tail_ids], dim=1)
+
+    def _split_chat_template(self, system_prompt: str, user_content: str):
+        """
+        Render the chat template around a placeholder user turn and split it there.
+        The split is only used if it tokenizes identically to the full template.
+        """
+        placeholder = "\x00user\x00"
+        messages = [{"role": "system", "content": system_prompt}]
+        template = self.processing_class.apply_chat_template(
+            messages + [{"role": "user", "content": placeholder}],
+            tokenize=False,
+            add_generation_prompt=True,
+        )
+        prefix, found, suffix = template.partition(placeholder)
+        if not found:
+            return False
+
+        prefix_ids = self.processing_class(
+            prefix, add_special_tokens=False, return_tensors="pt"
+        ).input_ids
+        tail_ids = self.processing_class(
+            user_content + suffix, add_special_tokens=False, return_tensors="pt"
+        ).input_ids
+        full_ids = self.processing_class.apply_chat_template(
+            messages + [{"role": "user", "content": user_content}],
+            tokenize=True,
+            add_generation_prompt=True,
+            return_tensors="pt",
+        )
+        if not torch.equal(torch.cat([prefix_ids, tail_ids], dim=1), full_ids):
+            return False
+        return prefix_ids, suffix
+
+    def _to_model_device(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Copy a host tensor to the model's device, via pinned memory on CUDA."""
+        device = self.model.device
+        if device.type != "cuda":
+            return tensor.to(device)
+        return tensor.pin_memory().to(device, non_blocking=True)
+
+    def _inference_autocast(self):
+        """
+        Run eval generation and PRG scoring in bf16 when the model is held in fp32
+        on a GPU that supports it; training weights stay untouched.
+        """
+        if (
+            self.model.device.type == "cuda"
+            and self.model.dtype == torch.float32
+            and torch.cuda.is_bf16_supported()
+        ):
+            return torch.autocast(device_type="cuda", dtype=torch.bfloat16)
+        return nullcontext()
+
+    @contextmanager
+    def _inference_forward(self):
+        """Swap in the compiled forward for the duration of an inference call."""
+        if not self._compile_generate or self.model.device.type != "cuda":
+            yield
+            return
+
+        if self._compiled_forward is None:
+            try:
+                self._compiled_forward = torch.compile(
+                    self.model.forward, mode="reduce-overhead"
+                )
+            except Exception as e:
+                get_logger().info(f"torch.compile unavailable, running eagerly: {e}")
+                self._compile_generate = False
+                yield
+                return
+        # Restore whatever forward was set on the instance (e.g. accelerate hooks).
+        prev_forward = self.model.__dict__.get("forward")
+        self.model.forward = self._compiled_forward
+        try:
+            yield
+        finally:
+            if prev_forward is None:
+                del self.model.forward
+            else:
+                self.model.forward = prev_forward
 
     @torch.no_grad()
     def play_prg_game_logits(
@@ -125,23 +265,20 @@ class GRPOTrainerModule(GRPOLanguageTrainerModule, LoggerMixin):
         get_logger().info(f"New clue received for PRG: {game_clue_dict}")
 
         try:
-            choices_str = ", ".join(choices)
-            custom_prompt = f"{clue}\nPossible Answers: {choices_str}\nAnswer:"
-            
-            # Generate answer using the model with custom prompt
-            prompt = [
-                {"role": "system", "content": PRG_SYSTEM_PROMPT_NO_THINKING},
-                {"role": "user", "content": custom_prompt},
-            ]
-            input_ids = self.processing_class.apply_chat_template(
-                prompt,
-                tokenize=True,
-                add_generation_prompt=True,
-                return_tensors="pt",
-            )
+            # A clue is replayed until it is answered; reuse its prompt ids.
+            prompt_key = (clue, tuple(choices))
+            if self._prg_prompt_cache is not None and self._prg_prompt_cache[0] == prompt_key:
+                input_ids = self._prg_prompt_cache[1]
+            else:
+                choices_str = ", ".join(choices)
+                custom_prompt = f"{clue}\nPossible Answers: {choices_str}\nAnswer:"
 
-            # TODO: Make the dtype changes from genrl here?
-            input_ids = input_ids.to(self.model.device)
+                # Generate answer using the model with custom prompt
+                input_ids = self._chat_input_ids(
+                    PRG_SYSTEM_PROMPT_NO_THINKING, custom_prompt
+                )
+                input_ids = self._to_model_device(input_ids)
+                self._prg_prompt_cache = (prompt_key, input_ids)
             
             # Get logits for each choice
             choice_logits = self._get_choice_logits(input_ids, choices)
@@ -166,32 +303,136 @@ class GRPOTrainerModule(GRPOLanguageTrainerModule, LoggerMixin):
         Returns a tensor of shape (len(choices),) giving, for each choice,
         the sum of log-probabilities that the model assigns to generating
         "<answer>{choice}</answer>" after the given input_ids.
+        The prompt is prefilled once and every choice is scored against its
+        KV-cache in a single batched forward pass.
         """
 
         device = input_ids.device
         batch_size, prompt_len = input_ids.shape
-        logits_list = []
-
-        for choice in choices:
-            # 1) build the full token sequence: prompt + "<answer>…</answer>"
-            # TODO: Make the dtype changes from genrl here?
-            answer_str = f"<answer>{choice}</answer>"
-            choice_ids = self.processing_class(
-                answer_str,
-                return_tensors="pt",
-                add_special_tokens=False
-            ).input_ids.to(device)    # shape (1, L)
+        num_choices = len(choices)
 
-            seq = torch.cat([input_ids, choice_ids], dim=1)  # (1, prompt_len + L)
+        # 1) tokenize every "<answer>…</answer>" and right-pad into (N, L_max)
+        choice_ids = [
+            self.processing_class(
+                f"<answer>{choice}</answer>", add_special_tokens=False
+            ).input_ids
+            for choice in choices
+        ]
+        # Shortcut: choices that differ in a single token need one forward pass
+        decision_split = self._split_decision_token(choice_ids)
+        if decision_split is not None:
+            return self._score_decision_token(input_ids, *decision_split)
 
-            # build labels that only include the answer positions
-            labels = seq.clone()
-            labels[:, :prompt_len] = -100  # ignore prompt positions in loss
-            outputs = self.model(input_ids=seq, labels=labels)
-            # outputs.loss is average negative log-likelihood over the L answer tokens
+        # Build the padded batch on the host and copy it over in one transfer
+        lengths = torch.tensor([len(ids) for ids in choice_ids])
+        max_len = int(lengths.max())
+        padded = torch.zeros((num_choices, max_len), dtype=torch.long)
+        for i, ids in enumerate(choice_ids):
+            padded[i, : len(ids)] = torch.tensor(ids)
+        padded = self._to_model_device(padded)
+        lengths = self._to_model_device(lengths)
+        answer_mask = torch.arange(max_len, device=device) < lengths.unsqueeze(1)
 
-            total_log_prob = -outputs.loss * choice_ids.size(1)
-            logits_list.append(total_log_prob)
+        # 2) prefill the shared prompt once, then run only the answers against
+        # its cache; padding sits after the answer so it never influences the
+        # positions we score
+        attention_mask = torch.cat(
+            [
+                torch.ones((num_choices, prompt_len), dtype=torch.long, device=device),
+                answer_mask.long(),
+            ],
+            dim=1,
+        )
+        last_logit_only = self._logits_to_keep_kwargs(1)
+        with self._inference_autocast():
+            prefix_out = self.model(
+                input_ids=input_ids, use_cache=True, **last_logit_only
+            )
+            past_key_values = self._repeat_cache(
+                prefix_out.past_key_values, num_choices
+            )
+            suffix_out = self.model(
+                input_ids=padded,
+                attention_mask=attention_mask,
+                past_key_values=past_key_values,
+                use_cache=False,
+            )
+
+        # 3) log-prob of each answer token, taken from the preceding position:
+        # the first comes from the last prompt position, the rest from the answer
+        answer_logits = torch.cat(
+            [
+                prefix_out.logits[:, -1:, :].expand(num_choices, -1, -1),
+                suffix_out.logits[:, :-1, :],
+            ],
+            dim=1,
+        ).float()
+        token_log_probs = torch.log_softmax(answer_logits, dim=-1).gather(
+            -1, padded.unsqueeze(-1)
+        ).squeeze(-1)
+        return (token_log_probs * answer_mask).sum(dim=1)
+
+    def _logits_to_keep_kwargs(self, n: int) -> dict:
+        """
+        Forward kwargs that make the LM head run on the last n positions only, so
+        a prefill skips full-vocab logits for every prompt token.
+        """
+        if self._logits_to_keep_kwarg is None:
+            params = inspect.signature(self.model.forward).parameters
+            self._logits_to_keep_kwarg = next(
+                (k for k in ("logits_to_keep", "num_logits_to_keep") if k in params),
+                "",
+            )
+        if not self._logits_to_keep_kwarg:
+            return {}
+        return {self._logits_to_keep_kwarg: n}
 
-        # stack into a single tensor of shape (num_choices,)
-        return torch.stack(logits_list)
\ No newline at end of file
+    @staticmethod
+    def _split_decision_token(choice_ids: List[List[int]]):
+        """
+        If every choice tokenizes identically except at one position, where all
+        tokens are distinct, return (shared tokens before it, decision tokens).
+        """
+        length = len(choice_ids[0])
+        if len(choice_ids) < 2 or any(len(ids) != length for ids in choice_ids):
+            return None
+        diff = [k for k in range(length) if len({ids[k] for ids in choice_ids}) > 1]
+        if len(diff) != 1:
+            return None
+        decision_ids = [ids[diff[0]] for ids in choice_ids]
+        if len(set(decision_ids)) != len(decision_ids):
+            return None
+        return choice_ids[0][: diff[0]], decision_ids
+
+    def _score_decision_token(
+        self, input_ids: torch.Tensor, shared_ids: List[int], decision_ids: List[int]
+    ) -> torch.Tensor:
+        """
+        Score choices that differ only in one token from a single forward pass over
+        prompt + shared tokens. The tokens after the decision token (e.g. the
+        closing tag) are the same for every choice and are not scored.
+        """
+        device = input_ids.device
+        shared = torch.tensor([shared_ids], dtype=torch.long, device=device)
+        seq = torch.cat([input_ids, shared], dim=1)
+        keep = len(shared_ids) + 1
+        with self._inference_autocast():
+            logits = self.model(input_ids=seq, **self._logits_to_keep_kwargs(keep)).logits
+        log_probs = torch.log_softmax(logits[0, -keep:, :].float(), dim=-1)
+
+        shared_log_prob = log_probs[:-1].gather(-1, shared[0].unsqueeze(-1)).sum()
+        decision = torch.tensor(decision_ids, dtype=torch.long, device=device)
+        return shared_log_prob + log_probs[-1, decision]
+
+    @staticmethod
+    def _repeat_cache(past_key_values, n: int):
+        """Repeat a batch-1 KV-cache along the batch dim for n sequences."""
+        if n == 1:
+            return past_key_values
+        if hasattr(past_key_values, "batch_repeat_interleave"):
+            past_key_values.batch_repeat_interleave(n)
+            return past_key_values
+        # Legacy tuple-of-tuples cache: expanding is a view, no copy needed.
+        return tuple(
+            tuple(t.expand(n, *t.shape[1:]) for t in layer) for layer in past_key_values
+        )
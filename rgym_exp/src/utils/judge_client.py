@@ -1,7 +1,27 @@
+import json
+import logging
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 from genrl.logging_utils.global_defs import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+# (connect, read) timeout in seconds for judge requests
+JUDGE_TIMEOUT = (5, 60)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    return orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+
+
+def _loads(content: bytes) -> Any:
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
 
 class JudgeClient:
     """
@@ -18,6 +38,14 @@ class JudgeClient:
         """
         self.base_url = base_url.rstrip('/')
         self.logger = get_logger()
+        # Reuse keep-alive connections to the judge across requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # ETag and body of the last clue, for conditional polling
+        self._clue_etag = None
+        self._last_clue = None
     
     def request_question(self, user_id: str, round_number: int, model_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -38,14 +66,17 @@ class JudgeClient:
                 "model_name": model_name,
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/request-question/", 
-                json=request_data
+                data=_dumps(request_data),
+                headers=JSON_HEADERS,
+                timeout=JUDGE_TIMEOUT,
             )
             
             if response.status_code == 200:
-                result = response.json()
-                self.logger.debug(f'Received question: {result["question"]}')
+                result = _loads(response.content)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f'Received question: {result["question"]}')
                 return result
             else:
                 self.logger.debug(f"Failed to receive question: {response.status_code}")
@@ -57,17 +88,29 @@ class JudgeClient:
     
     def get_current_clue(self) -> Optional[Dict[str, Any]]:
         """
-        Get the current clue from the judge service.
+        Get the current clue from the judge service. If the service sent an ETag
+        with the last clue, the request is conditional and a 304 reuses that clue.
         
         Returns:
             Dictionary containing clue data or None if request failed
         """
         try:
-            response = requests.get(f"{self.base_url}/current_clue/")
-            
+            headers = {"If-None-Match": self._clue_etag} if self._clue_etag else None
+            response = self.session.get(
+                f"{self.base_url}/current_clue/",
+                headers=headers,
+                timeout=JUDGE_TIMEOUT,
+            )
+
+            if response.status_code == 304 and self._last_clue is not None:
+                self.logger.debug("Clue unchanged since last poll")
+                return self._last_clue
             if response.status_code == 200:
-                result = response.json()
-                self.logger.debug(f'Received clue: {result["clue"]}')
+                result = _loads(response.content)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f'Received clue: {result["clue"]}')
+                self._clue_etag = response.headers.get("ETag")
+                self._last_clue = result
                 return result
             else:
                 self.logger.debug(f"Failed to receive clue: {response.status_code}")
@@ -97,14 +140,17 @@ class JudgeClient:
                 "user_answer": user_answer,
             }
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/submit-answer/", 
-                json=submission_data
+                data=_dumps(submission_data),
+                headers=JSON_HEADERS,
+                timeout=JUDGE_TIMEOUT,
             )
 
             if response.status_code == 200:
-                result = response.json()
-                self.logger.debug(f"Score: {result['score']}")
+                result = _loads(response.content)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Score: {result['score']}")
                 return result
             else:
                 self.logger.debug(f"Failed to submit answer: {response.status_code}")
@@ -0,0 +1,42 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def make_session() -> requests.Session:
+    session = requests.Session()
+    # Only failed connects are retried: the request never reached the proxy, so
+    # this is safe for non-idempotent calls like guess-answer. Read and status
+    # errors are surfaced to the caller.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(connect=3, read=0, status=0, backoff_factor=0.1),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Process-wide session so calls to the modal proxy reuse pooled connections.
+_SESSION = make_session()
+
+# Every call that changes state is a user operation from the same smart account,
+# and one sent while another is pending reuses its nonce and replaces it (see
+# modal-login/app/lib/sendUserOperation.ts). Chain submissions, registration and
+# PRG bets run on different threads, so the calls are sent one at a time.
+_SEND_LOCK = threading.Lock()
+
+
+def send_via_api(org_id, modal_proxy_url, method, args):
+    # Construct URL and payload.
+    url = modal_proxy_url + method
+    payload = {"orgId": org_id} | args
+
+    # Send the POST request.
+    with _SEND_LOCK:
+        response = _SESSION.post(url, json=payload)
+    response.raise_for_status()  # Raise an exception for HTTP errors
+    return response.json()
@@ -0,0 +1,41 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from rgym_exp.src.utils.modal_api import send_via_api
+
+
+def test_send_via_api_serializes_calls():
+    """Calls from different threads never overlap at the proxy."""
+    in_flight = 0
+    max_in_flight = 0
+    counter_lock = threading.Lock()
+
+    def post(url, json):
+        nonlocal in_flight, max_in_flight
+        with counter_lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with counter_lock:
+            in_flight -= 1
+        response = MagicMock()
+        response.json.return_value = {}
+        return response
+
+    with patch("rgym_exp.src.utils.modal_api._SESSION") as session:
+        session.post.side_effect = post
+        threads = [
+            threading.Thread(
+                target=send_via_api,
+                args=("test-org", "http://localhost:3000/api/", method, {"peerId": "p"}),
+            )
+            for method in ("submit-reward", "submit-winner", "guess-answer", "claim-reward")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert session.post.call_count == 4
+    assert max_in_flight == 1
@@ -1,14 +1,18 @@
-import hashlib
 import logging
+import multiprocessing
 import threading
 import time
 import uuid
 import random
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Optional
+from itertools import chain
+from typing import Any, Iterator, NamedTuple, Optional
 from .game_tree import Payload, from_bytes
 
+import xxhash
 from hivemind.dht import DHT
 
 from hivemind_exp.chain_utils import ModalSwarmCoordinator
@@ -21,6 +25,45 @@ from .kinesis import (
     Kinesis,
 )
 
+# Below this many peers, decoding inline is cheaper than shipping bytes to workers.
+DECODE_POOL_MIN_PEERS = 32
+# Spawned workers re-run the server's imports (hivemind, torch) at startup, so
+# each one costs a few hundred MB; keep the pool small.
+DECODE_POOL_WORKERS = 2
+# Most gossip messages published per poll.
+GOSSIP_SAMPLE_SIZE = 200
+# How many published gossip ids are remembered to avoid republishing them.
+PUBLISHED_ID_HISTORY = 100_000
+
+# Adaptive polling: once enough round lengths have been observed, the next poll
+# is aimed at when the current round is likely to end, within these bounds.
+ROUND_HISTORY_SIZE = 32
+ADAPTIVE_MIN_SAMPLES = 8
+MIN_POLL_SECONDS = 10.0
+POLL_JITTER = 0.05
+
+# Dedicated generator for gossip sampling, kept apart from the global random state.
+_rng = random.Random()
+
+
+class _ContextAdapter(logging.LoggerAdapter):
+    """LoggerAdapter that merges its bound context into each call's extra."""
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **kwargs["extra"]} if "extra" in kwargs else self.extra
+        return msg, kwargs
+
+
+class GossipRow(NamedTuple):
+    """A single gossip message waiting to be published."""
+
+    timestamp: datetime
+    id: str
+    message: str
+    node: str
+    node_id: str
+    dataset: Optional[str] = None
+
 
 class BaseDHTPublisher(ABC):
     """
@@ -129,7 +172,13 @@ class BaseDHTPublisher(ABC):
                 },
             )
             self._poll_once()
-            time.sleep(self.poll_interval_seconds)
+            # Wakes as soon as stop() sets the event instead of sleeping out the interval.
+            if self._stop_event.wait(self._next_poll_delay()):
+                break
+
+    def _next_poll_delay(self) -> float:
+        """Seconds to wait before the next poll."""
+        return self.poll_interval_seconds
 
     @abstractmethod
     def _poll_once(self):
@@ -157,31 +206,112 @@ class GossipDHTPublisher(BaseDHTPublisher):
         super().__init__(
             dht, kinesis_client, logger, poll_interval_seconds, coordinator=coordinator
         )
+        # from_bytes is pure Python, so large rounds are decoded across processes.
+        self._decode_pool = None
+        # (round, {(subkey, expiration)}) of the last DHT value processed
+        self._last_fingerprint = None
+        # Observed round lengths in seconds, and when the last round change was seen
+        self._round_durations = deque(maxlen=ROUND_HISTORY_SIZE)
+        self._last_round_change = None
+        # Ids of recently published gossip, oldest first, with a set for lookups
+        self._published_order = deque()
+        self._published_ids = set()
+
+    def stop(self):
+        """Stop the polling thread and the decode workers."""
+        super().stop()
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self._decode_pool = None
+
+    def _record_round_change(self):
+        """Note that a new round was observed, timing the one that just ended."""
+        now = time.monotonic()
+        if self._last_round_change is not None:
+            self._round_durations.append(now - self._last_round_change)
+        self._last_round_change = now
+
+    def _next_poll_delay(self) -> float:
+        """
+        Aim the next poll at the median of the remaining round length, taken over the
+        observed rounds that would still be running by now. Until enough rounds have
+        been seen, or once this round has outlasted all of them, the fixed interval is
+        used. The delay never exceeds the fixed interval, so adapting only polls
+        sooner and the end of a round isn't missed.
+        """
+        if len(self._round_durations) < ADAPTIVE_MIN_SAMPLES:
+            return self.poll_interval_seconds
+
+        elapsed = time.monotonic() - self._last_round_change
+        remaining = sorted(d - elapsed for d in self._round_durations if d > elapsed)
+        if not remaining:
+            return self.poll_interval_seconds
+
+        delay = remaining[len(remaining) // 2]
+        delay *= 1 + _rng.uniform(-POLL_JITTER, POLL_JITTER)
+        return min(max(delay, MIN_POLL_SECONDS), self.poll_interval_seconds)
+
+    def _remember_published(self, gossip: list[GossipRow]):
+        """Record gossip ids as published, forgetting the oldest past the history size."""
+        for row in gossip:
+            if row.id in self._published_ids:
+                continue
+            if len(self._published_order) >= PUBLISHED_ID_HISTORY:
+                self._published_ids.discard(self._published_order.popleft())
+            self._published_order.append(row.id)
+            self._published_ids.add(row.id)
+
+    def _decode_payloads(self, values: list[bytes]) -> Iterator[Any]:
+        """
+        Lazily decode each peer's payload bytes, in worker processes when there are
+        many. Results come back in order, one at a time, so the caller only needs to
+        keep the payload it is currently sampling from.
+        """
+        if len(values) < DECODE_POOL_MIN_PEERS:
+            return (from_bytes(value) for value in values)
+
+        if self._decode_pool is None:
+            self._decode_pool = ProcessPoolExecutor(
+                max_workers=DECODE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._decode_pool.map(from_bytes, values, chunksize=16)
 
     def _poll_once(self):
+        # Context shared by every record this poll logs.
+        log = _ContextAdapter(
+            self.logger, {"class": self.class_name, "poll_id": self.poll_id}
+        )
         try:
+            # The round rarely changes between polls, so fetch the last known round's
+            # gossip from the DHT while the coordinator is asked for the current one.
+            prefetched_round = self.current_round
+            prefetch = (
+                self.dht.get(str(prefetched_round), return_future=True)
+                if prefetched_round >= 0
+                else None
+            )
+
             new_round, new_stage = self.coordinator.get_round_and_stage()
 
-            self.logger.info(
+            log.info(
                 "Polled for round/stage",
-                extra={
-                    "class": self.class_name,
-                    "round": new_round,
-                    "stage": new_stage,
-                    "poll_id": self.poll_id,
-                }
+                extra={"round": new_round, "stage": new_stage},
             )
 
+            # The first round seen after startup is joined midway, so only real
+            # transitions count towards round timing.
+            if new_round != self.current_round and self.current_round >= 0:
+                self._record_round_change()
+
             if new_round != self.current_round or new_stage != self.current_stage:
-                self.logger.info(
+                log.info(
                     "Round/stage changed",
                     extra={
-                        "class": self.class_name,
                         "old_round": self.current_round,
                         "old_stage": self.current_stage,
                         "new_round": new_round,
                         "new_stage": new_stage,
-                        "poll_id": self.poll_id,
                     }
                 )
 
@@ -189,107 +319,151 @@ class GossipDHTPublisher(BaseDHTPublisher):
             self.current_round = new_round
             self.current_stage = new_stage
 
-            round_gossip = []
-
-            round_data = self.dht.get(str(self.current_round))
+            if prefetch is not None and prefetched_round == self.current_round:
+                round_data = prefetch.result()
+            else:
+                if prefetch is not None:
+                    prefetch.cancel()
+                round_data = self.dht.get(str(self.current_round))
             if not round_data:
-                self.logger.info("No gossip found for round", extra={"round": self.current_round})
+                log.info("No gossip found for round", extra={"round": self.current_round})
                 return
 
             # Update the last polled time
             self.last_polled = datetime.now(timezone.utc)
 
-            for peer_id, value_with_expiration in round_data.value.items():
-                bytes = value_with_expiration.value
-                payload_dict = from_bytes(bytes)
-
-                # Flatten the payloads into a list of payloads.
-                all_payloads = []
-                for _, payload_list in payload_dict.items():
-                    all_payloads.extend(payload_list)
-
-                # For each payload, generate a gossip message.
-                for payload in all_payloads:
-                    world_state_tuple = payload.world_state
-                    question = world_state_tuple.environment_states["question"]
-                    actions = payload.actions
-                    source_dataset = world_state_tuple.environment_states["metadata"]["source_dataset"]
-                    action = random.choice(actions) if actions else ""
-
-                    # Stamp the message with the current time.
-                    now_utc = datetime.now(timezone.utc)
-                    ts = int(now_utc.timestamp())
-
-                    # Generate a unique ID for the gossip message.
-                    gossip_id = hashlib.md5(f"{question}-{peer_id}-{self.current_round}-{action}-{source_dataset}".encode()).hexdigest()
-                    round_gossip.append((
-                        ts, {
-                            "id": gossip_id,
-                            "message": f"{question}...{action}",
-                            "node": get_name_from_peer_id(peer_id),
-                            "nodeId": peer_id,
-                            "dataset": source_dataset,
-                        }
-                    ))
-
-            self.logger.info("Got gossip messages", extra={
-                "message_count": len(round_gossip),
+            # Peers re-store their value whenever they publish, which moves its
+            # expiration; if nothing moved, there is nothing new to decode. Every
+            # subkey is compared since a peer with a lagging clock can re-store
+            # with an expiration below the round's latest.
+            fingerprint = (
+                self.current_round,
+                frozenset(
+                    (subkey, v.expiration_time) for subkey, v in round_data.value.items()
+                ),
+            )
+            if fingerprint == self._last_fingerprint:
+                log.info("No new gossip since last poll", extra={"round": self.current_round})
+                return
+
+            # Stamp every message from this poll with the same time.
+            polled_at = self.last_polled.replace(microsecond=0)
+            current_round = self.current_round
+
+            peer_items = list(round_data.value.items())
+            payload_dicts = self._decode_payloads(
+                [value_with_expiration.value for _, value_with_expiration in peer_items]
+            )
+
+            # Reservoir sample (Algorithm R) the (peer, payload) pairs down to
+            # GOSSIP_SAMPLE_SIZE, drawn uniformly so a single peer doesn't fill the
+            # batch. Gossip messages are only built for the pairs that survive.
+            candidates = []
+            message_count = 0
+            # Locals for the loop below, which runs once per payload in the round.
+            randrange = _rng.randrange
+            sample_size = GOSSIP_SAMPLE_SIZE
+            add_candidate = candidates.append
+            for (peer_id, _), payload_dict in zip(peer_items, payload_dicts):
+                for payload in chain.from_iterable(payload_dict.values()):
+                    if message_count < sample_size:
+                        add_candidate((peer_id, payload))
+                    else:
+                        j = randrange(message_count + 1)
+                        if j < sample_size:
+                            candidates[j] = (peer_id, payload)
+                    message_count += 1
+
+            log.info("Got gossip messages", extra={
+                "message_count": message_count,
             })
 
-            # Shuffle the gossip messages to attempt to avoid getting only 1 peer, and only publish 200.
-            random.shuffle(round_gossip)
-            round_gossip = round_gossip[:200]
+            # For each sampled payload, generate a gossip message. Peers often give
+            # the same answer to the same question; those are only published once.
+            round_gossip = []
+            seen = set()
+            add_gossip = round_gossip.append
+            hexdigest = xxhash.xxh64_hexdigest
+            peer_name = get_name_from_peer_id
+            for peer_id, payload in candidates:
+                environment_states = payload.world_state.environment_states
+                question = environment_states["question"]
+                actions = payload.actions
+                source_dataset = environment_states["metadata"]["source_dataset"]
+                action = actions[randrange(len(actions))] if actions else ""
+
+                content_key = (question, action, source_dataset)
+                if content_key in seen:
+                    continue
+                seen.add(content_key)
+
+                # Generate a unique ID for the gossip message.
+                gossip_id = hexdigest(f"{question}-{peer_id}-{current_round}-{action}-{source_dataset}")
+                add_gossip(
+                    GossipRow(
+                        polled_at,
+                        gossip_id,
+                        f"{question}...{action}",
+                        peer_name(peer_id),
+                        peer_id,
+                        source_dataset,
+                    )
+                )
 
-            self._publish_gossip(round_gossip)
+            # Only skip this DHT value from now on if it was actually published.
+            if self._publish_gossip(round_gossip):
+                self._last_fingerprint = fingerprint
 
         except Exception as e:
-            self.logger.error(
+            log.error(
                 "Error polling for round/stage in gossip",
-                extra={
-                    "class": self.class_name,
-                    "error": str(e),
-                    "poll_id": self.poll_id,
-                },
+                extra={"error": str(e)},
             )
 
-    def _publish_gossip(self, gossip: list[tuple[float, dict[str, Any]]]):
+    def _publish_gossip(self, gossip: list[GossipRow]) -> bool:
         """
         Publish gossip data to Kinesis.
 
         Args:
-            gossip_data: The gossip data from the DHT
+            gossip: The sampled gossip rows from the DHT
+
+        Returns:
+            False if publishing failed, True otherwise
         """
         try:
+            # Gossip ids hash the message content, so a seen id means the same message
+            # was already published by an earlier poll.
+            gossip = [row for row in gossip if row.id not in self._published_ids]
             if not gossip:
                 self.logger.info("No gossip data to publish")
-                return
+                return True
 
             self.logger.info(
                 "Publishing gossip messages", extra={"num_messages": len(gossip)}
             )
-            gossip_data = []
-
-            for ts, g in gossip:
-                dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-                gossip_data.append(
-                    GossipMessageData(
-                        id=g["id"],
-                        peerId=g["nodeId"],
-                        peerName=g["node"],
-                        message=g["message"],
-                        timestamp=dt,
-                        dataset=g.get("dataset"),
-                    )
+            gossip_data = [
+                GossipMessageData(
+                    id=row.id,
+                    peerId=row.node_id,
+                    peerName=row.node,
+                    message=row.message,
+                    timestamp=row.timestamp,
+                    dataset=row.dataset,
                 )
+                for row in gossip
+            ]
 
             if len(gossip_data) > 0:
                 self.kinesis_client.put_gossip(
                     GossipMessage(type="gossip", data=gossip_data)
                 )
+                self._remember_published(gossip)
                 self.logger.info("Successfully published gossip")
+            return True
 
         except Exception as e:
             self.logger.error(
                 "Error publishing gossip",
                 extra={"error": str(e), "poll_id": self.poll_id},
             )
+            return False
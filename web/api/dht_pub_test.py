@@ -1,6 +1,7 @@
 import logging
 import sys
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
@@ -14,17 +15,11 @@ sys.path.append(str(parent_dir))
 # because these functions are only copied over at build time in Docker and aren't available during local testing.
 # This allows us to test the DHTPublisher class without needing the actual hivemind_exp module.
 
-from api.dht_pub import GossipDHTPublisher
+from api.dht_pub import ADAPTIVE_MIN_SAMPLES, GossipDHTPublisher, GossipRow
 from api.game_tree import Payload, WorldState, to_bytes, from_bytes
 from api.kinesis import GossipMessage, GossipMessageData
 
 
-# Wraps data put into the DHT so we can mock the DHT.get method
-class DummyValue:
-    def __init__(self, value):
-        self.value = value
-
-
 class TestGossipDHTPublisher:
     """Tests for the GossipDHTPublisher class."""
 
@@ -38,16 +33,18 @@ class TestGossipDHTPublisher:
         self.mock_logger = logging.getLogger("test_logger")
         self.mock_logger.setLevel(logging.INFO)
 
-        # Add a handler to the logger so caplog can capture the logs
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.INFO)
+        # Add a handler to the logger so caplog can capture the logs. The logger
+        # is shared across tests, so only add it once.
+        if not self.mock_logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setLevel(logging.INFO)
 
-        # Use the JSON formatter from python-json-logger
-        json_formatter = jsonlogger.JsonFormatter(
-            "%(asctime)s %(levelname)s %(message)s %(extra)s"
-        )
-        handler.setFormatter(json_formatter)
-        self.mock_logger.addHandler(handler)
+            # Use the JSON formatter from python-json-logger
+            json_formatter = jsonlogger.JsonFormatter(
+                "%(asctime)s %(levelname)s %(message)s %(extra)s"
+            )
+            handler.setFormatter(json_formatter)
+            self.mock_logger.addHandler(handler)
 
         self.coordinator = MagicMock()
 
@@ -150,24 +147,20 @@ class TestGossipDHTPublisher:
         """Test publishing gossip data."""
         # Set up test data
         gossip_data = [
-            (
-                1000.0,
-                {
-                    "id": "id1",
-                    "message": "message1",
-                    "node": "node1",
-                    "nodeId": "peer_id_1",
-                    "dataset": "math",
-                },
+            GossipRow(
+                timestamp=datetime.fromtimestamp(1000, tz=timezone.utc),
+                id="id1",
+                message="message1",
+                node="node1",
+                node_id="peer_id_1",
+                dataset="math",
             ),
-            (
-                1001.0,
-                {
-                    "id": "id2",
-                    "message": "message2",
-                    "node": "node2",
-                    "nodeId": "peer_id_2",
-                },
+            GossipRow(
+                timestamp=datetime.fromtimestamp(1001, tz=timezone.utc),
+                id="id2",
+                message="message2",
+                node="node2",
+                node_id="peer_id_2",
             ),
         ]
 
@@ -208,6 +201,23 @@ class TestGossipDHTPublisher:
         assert caplog.records[0].message == "Publishing gossip messages"
         assert caplog.records[0].num_messages == 2
 
+    def test_publish_gossip_skips_already_published(self, caplog):
+        """Test that gossip published by an earlier poll is not published again."""
+        row = GossipRow(
+            timestamp=datetime.fromtimestamp(1000, tz=timezone.utc),
+            id="id1",
+            message="message1",
+            node="node1",
+            node_id="peer_id_1",
+        )
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+
+        self.publisher._publish_gossip([row])
+        self.publisher._publish_gossip([row])
+
+        self.publisher.kinesis_client.put_gossip.assert_called_once()
+        assert caplog.records[-1].message == "No gossip data to publish"
+
     def test_publish_gossip_no_data(self, caplog):
         """Test publishing gossip when there's no data."""
         # Mock the Kinesis client's put_gossip method
@@ -284,3 +294,154 @@ class TestGossipDHTPublisher:
         assert data_item.peer_name == "solitary finicky meerkat"
         assert data_item.peer_id == "test_peer_id"
         assert data_item.dataset == "calendar_arithmetic"  # Should be from metadata
+
+    @staticmethod
+    def _make_payload(question, action, dataset="calendar_arithmetic"):
+        world_state = WorldState(
+            environment_states={
+                "question": question,
+                "metadata": {"source_dataset": dataset},
+            },
+            opponent_states=None,
+            personal_states=None,
+        )
+        return Payload(world_state=world_state, actions=[action], metadata=None)
+
+    def _mock_round_data(self, values):
+        """Serve values ({peer_id: (payloads, expiration_time)}) as the round's DHT entry."""
+        round_data = MagicMock()
+        round_data.value = {}
+        for peer_id, (payloads, expiration_time) in values.items():
+            value_with_expiration = MagicMock()
+            value_with_expiration.value = to_bytes({"question_id": payloads})
+            value_with_expiration.expiration_time = expiration_time
+            round_data.value[peer_id] = value_with_expiration
+
+        # The prefetch for the current round goes through a future.
+        future = MagicMock()
+        future.result.return_value = round_data
+        self.publisher.dht.get = MagicMock(
+            side_effect=lambda key, return_future=False: future if return_future else round_data
+        )
+
+    def test_poll_once_unchanged_round_is_skipped(self, caplog):
+        """Test that a poll whose subkeys and expirations match the last one is skipped."""
+        self.coordinator.get_round_and_stage.return_value = (2, 1)
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self._mock_round_data({
+            "peer_a": ([self._make_payload("What is 2+2?", "4")], 100.0),
+            "peer_b": ([self._make_payload("What is 3+3?", "6")], 200.0),
+        })
+
+        self.publisher._poll_once()
+        self.publisher._poll_once()
+
+        self.publisher.kinesis_client.put_gossip.assert_called_once()
+        assert "No new gossip since last poll" in caplog.text
+
+    def test_poll_once_restored_subkey_is_reprocessed(self, caplog):
+        """Test that a re-store behind the round's latest expiration is still picked up."""
+        self.coordinator.get_round_and_stage.return_value = (2, 1)
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self._mock_round_data({
+            "peer_a": ([self._make_payload("What is 2+2?", "4")], 100.0),
+            "peer_b": ([self._make_payload("What is 3+3?", "6")], 200.0),
+        })
+        self.publisher._poll_once()
+
+        # peer_a's clock is behind: its new value expires before peer_b's, so the
+        # peer count and latest expiration are unchanged.
+        self._mock_round_data({
+            "peer_a": ([self._make_payload("What is 5+5?", "10")], 150.0),
+            "peer_b": ([self._make_payload("What is 3+3?", "6")], 200.0),
+        })
+        self.publisher._poll_once()
+
+        assert self.publisher.kinesis_client.put_gossip.call_count == 2
+        messages = [
+            item.message
+            for item in self.publisher.kinesis_client.put_gossip.call_args[0][0].data
+        ]
+        assert messages == ["What is 5+5?...10"]
+
+    def test_poll_once_retries_round_after_failed_publish(self):
+        """Test that an unchanged round is polled again if publishing it failed."""
+        self.coordinator.get_round_and_stage.return_value = (2, 1)
+        self.publisher.kinesis_client.put_gossip = MagicMock(
+            side_effect=[RuntimeError("kinesis unavailable"), None]
+        )
+        self._mock_round_data({
+            "peer_a": ([self._make_payload("What is 2+2?", "4")], 100.0),
+        })
+
+        self.publisher._poll_once()
+        assert self.publisher._last_fingerprint is None
+
+        self.publisher._poll_once()
+        assert self.publisher.kinesis_client.put_gossip.call_count == 2
+        assert self.publisher._last_fingerprint is not None
+
+    def test_poll_once_duplicate_payloads_collapse(self):
+        """Test that peers giving the same answer to the same question publish one row."""
+        self.coordinator.get_round_and_stage.return_value = (2, 1)
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self._mock_round_data({
+            "peer_a": ([self._make_payload("What is 2+2?", "4")], 100.0),
+            "peer_b": ([self._make_payload("What is 2+2?", "4")], 100.0),
+            "peer_c": ([self._make_payload("What is 2+2?", "5")], 100.0),
+        })
+
+        self.publisher._poll_once()
+
+        self.publisher.kinesis_client.put_gossip.assert_called_once()
+        messages = sorted(
+            item.message
+            for item in self.publisher.kinesis_client.put_gossip.call_args[0][0].data
+        )
+        assert messages == ["What is 2+2?...4", "What is 2+2?...5"]
+
+    def test_poll_once_caps_gossip_at_sample_size(self, caplog):
+        """Test that at most GOSSIP_SAMPLE_SIZE rows are published from one poll."""
+        self.coordinator.get_round_and_stage.return_value = (2, 1)
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self._mock_round_data({
+            f"peer_{p}": (
+                [self._make_payload(f"What is {p}+{q}?", str(p + q)) for q in range(5)],
+                100.0,
+            )
+            for p in range(4)
+        })
+
+        with patch("api.dht_pub.GOSSIP_SAMPLE_SIZE", 5):
+            self.publisher._poll_once()
+
+        self.publisher.kinesis_client.put_gossip.assert_called_once()
+        assert len(self.publisher.kinesis_client.put_gossip.call_args[0][0].data) == 5
+        got = next(r for r in caplog.records if r.message == "Got gossip messages")
+        assert got.message_count == 20
+
+    def test_next_poll_delay_adapts_to_round_length(self):
+        """Test that polls follow observed round lengths once enough are seen."""
+        self.publisher.poll_interval_seconds = 150
+
+        # Without history, the fixed interval is used
+        assert self.publisher._next_poll_delay() == 150
+
+        # Rounds have been taking 120s and the current one started 100s ago
+        self.publisher._round_durations.extend([120.0] * ADAPTIVE_MIN_SAMPLES)
+        self.publisher._last_round_change = time.monotonic() - 100.0
+
+        delay = self.publisher._next_poll_delay()
+        assert 19.0 <= delay <= 21.0
+
+        # Once the round outlasts every observed one, fall back to the fixed interval
+        self.publisher._last_round_change = time.monotonic() - 200.0
+        assert self.publisher._next_poll_delay() == 150
+
+    def test_next_poll_delay_never_exceeds_poll_interval(self):
+        """Test that long rounds don't stretch the delay past the fixed interval."""
+        self.publisher.poll_interval_seconds = 150
+        self.publisher._round_durations.extend([900.0] * ADAPTIVE_MIN_SAMPLES)
+        self.publisher._last_round_change = time.monotonic() - 100.0
+
+        assert self.publisher._next_poll_delay() == 150
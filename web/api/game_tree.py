@@ -1,11 +1,10 @@
-import sys
 import struct # Added for float serialization
 from types import NoneType
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Dict, List, Tuple
 
-@dataclass
-class Payload(dict):
+@dataclass(slots=True)
+class Payload:
     """
     Provides a template for organizing objects being communicated throughout the swarm.
     """
@@ -20,7 +19,7 @@ class Payload(dict):
     def __setitem__(self, key, value):
         setattr(self, key, value)
 
-@dataclass
+@dataclass(slots=True)
 class WorldState:
     environment_states: List[Any]
     opponent_states: List[Any]
@@ -37,31 +36,36 @@ class ObjType:
     WORLD_STATE = 8
     NONE = 9
 
+# Type tags and length headers are unsigned 64-bit big-endian integers.
+_U64 = struct.Struct(">Q")
+# A type tag immediately followed by a length header.
+_TYPE_AND_LEN = struct.Struct(">QQ")
+
 #### Deserialization methods ####
 
 def int_from_bytes(b: bytes, i: int) -> Tuple[int, int]:
-    n_bytes = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_bytes = _U64.unpack_from(b, i)[0]
     i += 8
     value = int.from_bytes(b[i : (i + n_bytes)], byteorder="big", signed=True)
     return value, i + n_bytes
 
 def float_from_bytes(b: bytes, i: int) -> Tuple[float, int]:
-    n_bytes = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_bytes = _U64.unpack_from(b, i)[0]
     i += 8
     value_tuple = struct.unpack('>d', b[i : (i + n_bytes)])
     value = value_tuple[0] # struct.unpack returns a tuple
     return value, i + n_bytes
 
 def string_from_bytes(b: bytes, i: int) -> Tuple[str, int]:
-    n_bytes = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_bytes = _U64.unpack_from(b, i)[0]
     i += 8
-    s = b[i : (i + n_bytes)].decode("utf-8")
+    s = str(b[i : (i + n_bytes)], "utf-8")
     i += n_bytes
     return s, i
 
 
 def list_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
-    n_items = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_items = _U64.unpack_from(b, i)[0]
     i += 8
     out = [None] * n_items
 
@@ -71,7 +75,7 @@ def list_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
 
 
 def dict_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
-    n_items = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_items = _U64.unpack_from(b, i)[0]
     i += 8
     out = {}
     for _ in range(n_items):
@@ -95,8 +99,9 @@ def world_state_from_bytes(b: bytes, i: int) -> Tuple[WorldState, int]:
 def none_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
     return None, i
 
-def boolean_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
-    return b[i] == b"0", i+1
+def boolean_from_bytes(b: bytes, i: int) -> Tuple[bool, int]:
+    # Booleans are written as ASCII b"0"/b"1"; b[i] is an int, so compare to ord("0").
+    return b[i] != 0x30, i+1
 
 _DESERIALIZATION_METHOD = {ObjType.LIST: list_from_bytes,
                             ObjType.DICT: dict_from_bytes,
@@ -108,12 +113,21 @@ _DESERIALIZATION_METHOD = {ObjType.LIST: list_from_bytes,
                             ObjType.WORLD_STATE: world_state_from_bytes,
                             ObjType.NONE: none_from_bytes}
 
+# The same table indexed by type tag, so decoding a value is a tuple index rather
+# than a membership test and a dict lookup. Tag 0 is unused.
+_DESERIALIZERS = tuple(
+    _DESERIALIZATION_METHOD.get(tag) for tag in range(max(_DESERIALIZATION_METHOD) + 1)
+)
+
 def from_bytes(b: bytes) -> Any:
-    return _from_bytes(b, 0)[0]
+    # Decode through a memoryview so the slices taken for values don't copy.
+    return _from_bytes(memoryview(b), 0)[0]
 
 def _from_bytes(b: bytes, i: int) -> Tuple[Any, int]:
-    obj_type = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    obj_type = _U64.unpack_from(b, i)[0]
     i += 8
+    if obj_type < len(_DESERIALIZERS) and _DESERIALIZERS[obj_type] is not None:
+        return _DESERIALIZERS[obj_type](b, i)
     return serializer_from_bytes(obj_type)(b, i)
 
 def serializer_from_bytes(obj_type: ObjType):
@@ -125,108 +139,76 @@ def serializer_from_bytes(obj_type: ObjType):
 
 #### Serialization methods ####
 
-def boolean_to_bytes(obj: bool) -> bytes:
-    type_bytes = ObjType.BOOLEAN.to_bytes(length=8, byteorder="big", signed=False)
-    bool_bytes = b"0" if not obj else b"1"
-    return type_bytes + bool_bytes
-
-def none_to_bytes(obj: None) -> bytes:
-    return ObjType.NONE.to_bytes(length=8, byteorder="big", signed=False)
-
-def payload_to_bytes(obj: Payload) -> bytes:
-    type_bytes = ObjType.PAYLOAD.to_bytes(length=8, byteorder="big", signed=False)
-    world_state_bytes = to_bytes(obj.world_state)
-    actions_bytes = to_bytes(obj.actions)
-    metadata_bytes = to_bytes(obj.metadata)
-    return type_bytes + world_state_bytes + actions_bytes + metadata_bytes
-
-def world_state_to_bytes(obj: WorldState) -> bytes:
-    type_bytes = ObjType.WORLD_STATE.to_bytes(length=8, byteorder="big", signed=False)
-    environment_states_bytes = to_bytes(obj.environment_states)
-    opponent_states_bytes = to_bytes(obj.opponent_states)
-    personal_bytes = to_bytes(obj.personal_states)
-    return type_bytes + environment_states_bytes + opponent_states_bytes + personal_bytes
+# Every serializer appends to one shared output buffer instead of returning its
+# own bytes, so nested objects are copied into the result exactly once.
+
+def boolean_to_buffer(obj: bool, buf: bytearray) -> None:
+    buf += _U64.pack(ObjType.BOOLEAN)
+    buf += b"0" if not obj else b"1"
+
+def none_to_buffer(obj: None, buf: bytearray) -> None:
+    buf += _U64.pack(ObjType.NONE)
+
+def payload_to_buffer(obj: Payload, buf: bytearray) -> None:
+    buf += _U64.pack(ObjType.PAYLOAD)
+    _to_buffer(obj.world_state, buf)
+    _to_buffer(obj.actions, buf)
+    _to_buffer(obj.metadata, buf)
+
+def world_state_to_buffer(obj: WorldState, buf: bytearray) -> None:
+    buf += _U64.pack(ObjType.WORLD_STATE)
+    _to_buffer(obj.environment_states, buf)
+    _to_buffer(obj.opponent_states, buf)
+    _to_buffer(obj.personal_states, buf)
     
-def int_to_bytes(obj: int) -> bytes:
-    type_bytes = ObjType.INTEGER.to_bytes(length=8, byteorder="big", signed=False)
-    byte_length = sys.getsizeof(obj)
-    int_bytes = obj.to_bytes(length=byte_length, byteorder="big", signed=True)
-    size_header = byte_length.to_bytes(length=8, byteorder="big", signed=False)
-    return type_bytes + size_header + int_bytes
-
-def float_to_bytes(obj: float) -> bytes:
-    type_bytes = ObjType.FLOAT.to_bytes(length=8, byteorder="big", signed=False)
+def int_to_buffer(obj: int, buf: bytearray) -> None:
+    # Smallest two's-complement width: magnitude bits plus a sign bit, rounded up.
+    byte_length = (obj.bit_length() + 8) // 8
+    buf += _TYPE_AND_LEN.pack(ObjType.INTEGER, byte_length)
+    buf += obj.to_bytes(length=byte_length, byteorder="big", signed=True)
+
+def float_to_buffer(obj: float, buf: bytearray) -> None:
     packed_float_bytes = struct.pack('>d', obj)
     byte_length = len(packed_float_bytes) # This will be 8 for '>d'
-    size_header = byte_length.to_bytes(length=8, byteorder="big", signed=False)
-    return type_bytes + size_header + packed_float_bytes
+    buf += _TYPE_AND_LEN.pack(ObjType.FLOAT, byte_length)
+    buf += packed_float_bytes
 
-def string_to_bytes(obj: str) -> bytes:
+def string_to_buffer(obj: str, buf: bytearray) -> None:
     serialized_obj = obj.encode("utf-8")
-    type_bytes = ObjType.STRING.to_bytes(length=8, byteorder="big", signed=False)
-    len_bytes = len(serialized_obj).to_bytes(length=8, byteorder="big", signed=False)
-    return type_bytes + len_bytes + serialized_obj
-
-def dict_to_bytes(obj: Dict[Any, Any]) -> bytes:
-    type_bytes = ObjType.DICT.to_bytes(length=8, byteorder="big", signed=False)
-    len_bytes = len(obj).to_bytes(length=8, byteorder="big", signed=False)
-    dict_bytes = []
+    buf += _TYPE_AND_LEN.pack(ObjType.STRING, len(serialized_obj))
+    buf += serialized_obj
+
+def dict_to_buffer(obj: Dict[Any, Any], buf: bytearray) -> None:
+    buf += _TYPE_AND_LEN.pack(ObjType.DICT, len(obj))
     for key, value in obj.items():
-        dict_bytes.append(to_bytes(key))
-        dict_bytes.append(to_bytes(value))
-    return type_bytes + len_bytes + b"".join(dict_bytes)
-
-def list_to_bytes(obj: List[Any]) -> bytes:
-    type_bytes = ObjType.LIST.to_bytes(length=8, byteorder="big", signed=False)
-    count_bytes = len(obj).to_bytes(length=8, byteorder="big", signed=False)
-    header = type_bytes + count_bytes
-    serialized_list = [to_bytes(x) for x in obj]
-    return header + b"".join(serialized_list)
-
-_SERIALIZATION_METHOD = {
-    ObjType.BOOLEAN: boolean_to_bytes,
-    ObjType.NONE: none_to_bytes,
-    ObjType.PAYLOAD: payload_to_bytes,
-    ObjType.WORLD_STATE: world_state_to_bytes,
-    ObjType.INTEGER: int_to_bytes,
-    ObjType.FLOAT: float_to_bytes,
-    ObjType.STRING: string_to_bytes,
-    ObjType.DICT: dict_to_bytes,
-    ObjType.LIST: list_to_bytes
+        _to_buffer(key, buf)
+        _to_buffer(value, buf)
+
+def list_to_buffer(obj: List[Any], buf: bytearray) -> None:
+    buf += _TYPE_AND_LEN.pack(ObjType.LIST, len(obj))
+    for x in obj:
+        _to_buffer(x, buf)
+
+# Exact Python type -> serializer. Subclasses are not matched, as before.
+_TYPE_TO_SERIALIZER = {
+    bool: boolean_to_buffer,
+    NoneType: none_to_buffer,
+    Payload: payload_to_buffer,
+    WorldState: world_state_to_buffer,
+    int: int_to_buffer,
+    float: float_to_buffer,
+    str: string_to_buffer,
+    dict: dict_to_buffer,
+    list: list_to_buffer,
 }
 
-def serializer_to_bytes(obj_type: Type):
-    if obj_type not in _SERIALIZATION_METHOD:
-        raise RuntimeError(
-            f"Unsupported type: {obj_type}; supported types are {list(_SERIALIZATION_METHOD.keys())}."
-        )
-    return _SERIALIZATION_METHOD[obj_type]
-
-def _type_to_objtype(obj_type: Type) -> ObjType:
-    """Maps Python types to ObjType constants"""
-    if obj_type is bool:
-        return ObjType.BOOLEAN
-    elif obj_type is NoneType:
-        return ObjType.NONE
-    elif obj_type is Payload:
-        return ObjType.PAYLOAD
-    elif obj_type is WorldState:
-        return ObjType.WORLD_STATE
-    elif obj_type is int:
-        return ObjType.INTEGER
-    elif obj_type is float:
-        return ObjType.FLOAT
-    elif obj_type is str:
-        return ObjType.STRING
-    elif obj_type is dict:
-        return ObjType.DICT
-    elif obj_type is list:
-        return ObjType.LIST
-    else:
-        raise RuntimeError(f"Unsupported type: {obj_type}")
-
 def to_bytes(obj: Any) -> bytes:
-    obj_type = _type_to_objtype(type(obj))
-    return serializer_to_bytes(obj_type)(obj)
-
-
+    buf = bytearray()
+    _to_buffer(obj, buf)
+    return bytes(buf)
+
+def _to_buffer(obj: Any, buf: bytearray) -> None:
+    serializer = _TYPE_TO_SERIALIZER.get(type(obj))
+    if serializer is None:
+        raise RuntimeError(f"Unsupported type: {type(obj)}")
+    serializer(obj, buf)
@@ -0,0 +1,25 @@
+from .game_tree import Payload, WorldState, from_bytes, to_bytes
+
+
+def test_boolean_round_trip():
+    """Test that booleans survive serialization"""
+    assert from_bytes(to_bytes(True)) is True
+    assert from_bytes(to_bytes(False)) is False
+    assert from_bytes(to_bytes([True, False, None])) == [True, False, None]
+
+
+def test_payload_round_trip():
+    """Test that a nested payload decodes to an equal payload"""
+    world_state = WorldState(
+        environment_states={
+            "question": "What is 2+2?",
+            "metadata": {"source_dataset": "calendar_arithmetic", "index": -3},
+        },
+        opponent_states=[1.5, "x"],
+        personal_states=None,
+    )
+    payload = Payload(world_state=world_state, actions=["4"], metadata={"ok": True})
+
+    assert from_bytes(to_bytes({"question_id": [payload]})) == {
+        "question_id": [payload]
+    }
@@ -1,4 +1,5 @@
 import multiprocessing
+import os
 
 import hivemind
 
@@ -7,13 +8,25 @@ import hivemind
 dht: hivemind.DHT | None = None
 
 
+def _dht_cache_settings() -> tuple[int, int]:
+    """DHT client cache size and nearest-peer count, overridable from the environment."""
+    cache_size = int(os.getenv("DHT_CACHE_SIZE", 2000))
+    cache_nearest = int(os.getenv("DHT_CACHE_NEAREST", 2))
+    return cache_size, cache_nearest
+
+
 def setup_global_dht(initial_peers, coordinator, logger, kinesis_client):
     global dht
+    cache_size, cache_nearest = _dht_cache_settings()
+    logger.info(
+        "DHT cache settings",
+        extra={"cache_size": cache_size, "cache_nearest": cache_nearest},
+    )
     dht = hivemind.DHT(
         start=True,
         startup_timeout=60,
         initial_peers=initial_peers,
-        cache_nearest=2,
-        cache_size=2000,
+        cache_nearest=cache_nearest,
+        cache_size=cache_size,
         client_mode=True,
     )
@@ -4,10 +4,19 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Literal, Optional
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from pydantic import BaseModel, Field, field_serializer
 
 
+# Keep the pooled HTTPS connection alive between polls, and retry throttled or
+# transient failures inside botocore rather than failing the whole publish.
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+
 class KinesisError(Exception):
     """Base exception for Kinesis operations"""
 
@@ -63,7 +72,9 @@ class Kinesis:
             return
 
         # Initialize Kinesis client if stream name is provided
-        self.kinesis = boto3.client("kinesis", region_name="us-west-2")
+        self.kinesis = boto3.client(
+            "kinesis", region_name="us-west-2", config=CLIENT_CONFIG
+        )
 
         # Verify stream exists
         try:
@@ -1,8 +1,10 @@
 import argparse
+import json
 import logging
 import os
 from datetime import datetime, timedelta
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
@@ -28,7 +30,18 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
                 log_record[key] = value
 
 
-json_formatter = CustomJsonFormatter("%(asctime)s %(levelname)s %(message)s")
+def _json_dumps(obj, default=None, **kwargs):
+    """Log-record serializer: orjson, falling back to json for what it rejects."""
+    try:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        # e.g. ints beyond 64 bits
+        return json.dumps(obj, default=default, **kwargs)
+
+
+json_formatter = CustomJsonFormatter(
+    "%(asctime)s %(levelname)s %(message)s", json_serializer=_json_dumps
+)
 
 # Configure the root logger
 root_logger = logging.getLogger()